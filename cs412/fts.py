@@ -0,0 +1,50 @@
+# File: fts.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: numbered pages of ranked SQLite FTS5 results, shared by the apps' search views
+
+from django.db import connection
+
+
+def search_enabled():
+    ''' full-text search needs SQLite's FTS5 tables, which only the apps' SQLite migrations create '''
+    return connection.vendor == 'sqlite'
+
+
+class SearchPage:
+    ''' one page of ranked search results '''
+
+    def __init__(self, object_list, number, has_next):
+        self.object_list = object_list
+        self.number = number
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self.number > 1
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+def page_of(queryset, ids, number, per_page):
+    '''
+    Return page number of the rows of queryset with these ranked ids, in
+    rank order. ids holds up to per_page + 1 ids from the page's offset;
+    the extra one only tells whether a further page follows.
+    '''
+    shown = ids[:per_page]
+    found = queryset.in_bulk(shown)
+    return SearchPage([found[pk] for pk in shown if pk in found], number, len(ids) > per_page)
+
+
+def page_number(params):
+    ''' return the page of search results in ?page= of params, 1 if it is missing or invalid '''
+    try:
+        return max(1, int(params.get('page', 1)))
+    except ValueError:
+        return 1
@@ -106,6 +106,29 @@ DATABASES = {
 }
 
 
+# Caches
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # rendered voter_analytics charts; least recently used entries are evicted first
+    'voter_charts': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'voter_charts',
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 256,
+        },
+    },
+}
+
+# answer voter_analytics counts and graphs from an in-memory NumPy snapshot
+# of the Voter table (needs numpy); when off, the rollup tables are used
+VOTER_ANALYTICS_COLUMNAR = False
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -157,3 +180,10 @@ CS_DEPLOYMENT_HOSTNAME = 'cs-webapps.bu.edu'
 if socket.gethostname() == CS_DEPLOYMENT_HOSTNAME:
     STATIC_URL = '/plum/static/'
     MEDIA_URL = '/plum/media/'
+
+# voter roll shown by voter_analytics when the request does not choose a dataset
+VOTER_ANALYTICS_DATASET = 'newton'
+
+# profiles with more followers than this are not fanned out to follower
+# timelines when they post; their posts are merged into feeds at read time
+MINI_INSTA_FANOUT_LIMIT = 1000
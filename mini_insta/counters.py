@@ -0,0 +1,51 @@
+# File: counters.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: upkeep of the denormalized post, follower, following and like counters
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .models import Follow, Like, Post, Profile
+
+
+def adjust_counters(model, pk, **deltas):
+    ''' add deltas to counter columns of one row in a single UPDATE, so concurrent writers do not lose counts '''
+    model.objects.filter(pk=pk).update(**{field: F(field) + n for field, n in deltas.items()})
+
+
+def counted(rows, group, field='pk', distinct=False):
+    ''' return a subquery counting rows grouped by an outer reference, 0 when there are none '''
+    rows = rows.order_by().values(group).annotate(n=Count(field, distinct=distinct)).values('n')
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def exact_counts():
+    '''
+    Return (model, counter field, expression) for every counter, where the
+    expression computes the true value for the outer row. Followers and
+    following are distinct profiles other than the profile itself, the same
+    as Profile.get_num_followers and Profile.get_num_following.
+    '''
+    followers = Follow.objects.filter(profile=OuterRef('pk')).exclude(follower_profile__username=OuterRef('username'))
+    following = Follow.objects.filter(follower_profile=OuterRef('pk')).exclude(profile__username=OuterRef('username'))
+    return [
+        (Profile, 'num_posts', counted(Post.objects.filter(profile=OuterRef('pk')), 'profile')),
+        (Profile, 'num_followers', counted(followers, 'profile', 'follower_profile', distinct=True)),
+        (Profile, 'num_following', counted(following, 'follower_profile', 'profile', distinct=True)),
+        (Post, 'num_likes', counted(Like.objects.filter(post=OuterRef('pk')), 'post')),
+    ]
+
+
+def reconcile_counters(dry_run=False):
+    '''
+    Recompute every counter in bulk and rewrite only the rows that drifted,
+    one UPDATE per counter. Returns a dict of 'model.field' to the number of
+    rows that were (or, with dry_run, would be) repaired.
+    '''
+    repaired = {}
+    with transaction.atomic():
+        for model, field, exact in exact_counts():
+            drifted = model.objects.alias(exact=exact).exclude(**{field: F('exact')})
+            name = f'{model._meta.model_name}.{field}'
+            repaired[name] = drifted.count() if dry_run else drifted.update(**{field: exact})
+    return repaired
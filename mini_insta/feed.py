@@ -0,0 +1,64 @@
+# File: feed.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: builds post querysets carrying everything a feed needs to render in a fixed number of queries
+
+from django.db.models import Exists, OuterRef, Prefetch, Value
+from django.urls import reverse
+from .counters import counted
+from .models import Comment, Like, Photo
+
+
+def with_first_photo(posts):
+    ''' prefetch only the first photo of each post, as the list first_photos '''
+    first_photo = Photo.objects.order_by('pk')[:1]
+    return posts.prefetch_related(Prefetch('photo_set', queryset=first_photo, to_attr='first_photos'))
+
+
+def with_feed_data(posts, viewer=None):
+    '''
+    Annotate a QuerySet of posts with what a feed card shows: the author
+    profile (joined in), the first photo (prefetched as first_photos), the
+    comment count, and whether the viewer's profile liked the post. Like
+    counts come from the num_likes counter column.
+    '''
+    posts = with_first_photo(posts.select_related('profile')).annotate(
+        num_comments=counted(Comment.objects.filter(post=OuterRef('pk')), 'post'),
+    )
+
+    if viewer is None:
+        return posts.annotate(is_liked=Value(False))
+    return posts.annotate(is_liked=Exists(Like.objects.filter(post=OuterRef('pk'), profile=viewer)))
+
+
+def photo_url(post):
+    ''' return the URL of the first photo of a post from with_first_photo, or None '''
+    return post.first_photos[0].get_image_url() if post.first_photos else None
+
+
+def grid_data(post):
+    ''' return the compact JSON of a post in a profile's post grid '''
+    return {
+        'id': post.pk,
+        'url': reverse('post', kwargs={'pk': post.pk}),
+        'photo': photo_url(post),
+    }
+
+
+def feed_data(post, user):
+    ''' return the compact JSON of a feed card for a post from with_feed_data, as seen by user '''
+    can_like = user.is_authenticated and post.profile.user_id != user.pk
+    return {
+        **grid_data(post),
+        'profile': {
+            'username': post.profile.username,
+            'display_name': post.profile.display_name,
+            'image': post.profile.profile_image_url,
+            'url': reverse('profile', kwargs={'pk': post.profile_id}),
+        },
+        'caption': post.caption,
+        'timestamp': post.timestamp.isoformat(),
+        'likes': post.num_likes,
+        'comments': post.num_comments,
+        'liked': post.is_liked,
+        'like_url': reverse('delete_like' if post.is_liked else 'like_post', kwargs={'pk': post.pk}) if can_like else None,
+    }
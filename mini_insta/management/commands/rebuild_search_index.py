@@ -0,0 +1,15 @@
+# File: rebuild_search_index.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: management command to refill the mini_insta profile and post search tables
+
+from django.core.management.base import BaseCommand, CommandError
+from mini_insta.search import rebuild_search_index, search_enabled
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index of profile names and post captions'
+
+    def handle(self, *args, **options):
+        if not search_enabled():
+            raise CommandError('full-text search needs the SQLite database backend')
+        rebuild_search_index()
+        self.stdout.write(self.style.SUCCESS('Rebuilt the profile and post search index'))
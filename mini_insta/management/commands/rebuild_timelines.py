@@ -0,0 +1,21 @@
+# File: rebuild_timelines.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: management command to refill every mini_insta feed timeline from the follows and posts
+
+from django.core.management.base import BaseCommand, CommandError
+from mini_insta.timelines import fanout_limit, rebuild_timelines
+
+class Command(BaseCommand):
+    help = 'Rebuilds the fan-out timelines, e.g. after changing MINI_INSTA_FANOUT_LIMIT'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='timeline entries per bulk insert (default 1000)')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        written = rebuild_timelines(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {written} timeline entries; profiles with more than {fanout_limit()} followers are read at feed time'))
@@ -0,0 +1,20 @@
+# File: reconcile_counters.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: management command to repair drift in the mini_insta post, follower, following and like counters
+
+from django.core.management.base import BaseCommand
+from mini_insta.counters import reconcile_counters
+
+class Command(BaseCommand):
+    help = 'Recounts posts, followers, following and likes and rewrites the counters that drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='only report how many counters have drifted')
+
+    def handle(self, *args, **options):
+        repaired = reconcile_counters(dry_run=options['dry_run'])
+        verb = 'Drifted' if options['dry_run'] else 'Repaired'
+        for name, n in repaired.items():
+            self.stdout.write(f'{verb} {name}: {n} rows')
+        self.stdout.write(self.style.SUCCESS(f'{verb} {sum(repaired.values())} counters'))
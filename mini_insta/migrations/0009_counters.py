@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:52
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def counted(rows, group, field="pk", distinct=False):
+    rows = rows.order_by().values(group).annotate(n=Count(field, distinct=distinct))
+    return Coalesce(Subquery(rows.values("n"), output_field=IntegerField()), 0)
+
+
+def fill_counters(apps, schema_editor):
+    """Set the counters from the existing rows, as mini_insta.counters.reconcile_counters does."""
+    Profile = apps.get_model("mini_insta", "Profile")
+    Post = apps.get_model("mini_insta", "Post")
+    Follow = apps.get_model("mini_insta", "Follow")
+    Like = apps.get_model("mini_insta", "Like")
+
+    followers = Follow.objects.filter(profile=OuterRef("pk")).exclude(
+        follower_profile__username=OuterRef("username")
+    )
+    following = Follow.objects.filter(follower_profile=OuterRef("pk")).exclude(
+        profile__username=OuterRef("username")
+    )
+    Profile.objects.update(
+        num_posts=counted(Post.objects.filter(profile=OuterRef("pk")), "profile"),
+        num_followers=counted(followers, "profile", "follower_profile", True),
+        num_following=counted(following, "follower_profile", "profile", True),
+    )
+    Post.objects.update(
+        num_likes=counted(Like.objects.filter(post=OuterRef("pk")), "post")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mini_insta", "0008_profile_user"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="num_likes",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="num_followers",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="num_following",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="num_posts",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:54
+
+from itertools import islice
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_timelines(apps, schema_editor):
+    """Deliver the existing posts of each profile not over the fan-out limit to its followers' timelines."""
+    Follow = apps.get_model("mini_insta", "Follow")
+    Post = apps.get_model("mini_insta", "Post")
+    TimelineEntry = apps.get_model("mini_insta", "TimelineEntry")
+    limit = getattr(settings, "MINI_INSTA_FANOUT_LIMIT", 1000)
+
+    follows = (
+        Follow.objects.exclude(follower_profile__username=models.F("profile__username"))
+        .filter(profile__num_followers__lte=limit)
+        .values_list("profile", "follower_profile")
+    )
+    owners = {}
+    for author, owner in follows:
+        owners.setdefault(author, set()).add(owner)
+
+    entries = (
+        TimelineEntry(owner_id=owner, post_id=pk, author_id=author, timestamp=timestamp)
+        for author, followers in owners.items()
+        for pk, timestamp in Post.objects.filter(profile=author)
+        .values_list("pk", "timestamp")
+        .iterator(chunk_size=1000)
+        for owner in followers
+    )
+    while True:
+        batch = list(islice(entries, 1000))
+        if not batch:
+            return
+        TimelineEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mini_insta", "0009_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TimelineEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("timestamp", models.DateTimeField()),
+                (
+                    "author",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="mini_insta.profile",
+                    ),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeline",
+                        to="mini_insta.profile",
+                    ),
+                ),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeline_entries",
+                        to="mini_insta.post",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["owner", "-timestamp", "-post"],
+                        name="timeline_owner_time_idx",
+                    ),
+                    models.Index(
+                        fields=["owner", "author"], name="timeline_owner_author_idx"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("owner", "post"), name="timeline_owner_post_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(fill_timelines, migrations.RunPython.noop),
+    ]
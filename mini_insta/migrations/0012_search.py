@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:10
+
+from django.db import migrations
+
+PROFILE_TABLE = "mini_insta_profile_search"
+POST_TABLE = "mini_insta_post_search"
+TOKENIZE = "prefix='1 2 3', tokenize='unicode61 remove_diacritics 2'"
+
+
+def create_search_tables(apps, schema_editor):
+    """Create and fill the FTS5 tables used for profile and post search."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {PROFILE_TABLE} USING fts5(username, display_name, {TOKENIZE})"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {PROFILE_TABLE} (rowid, username, display_name) "
+        "SELECT id, username, display_name FROM mini_insta_profile"
+    )
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {POST_TABLE} USING fts5(caption, {TOKENIZE})"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {POST_TABLE} (rowid, caption) SELECT id, caption FROM mini_insta_post"
+    )
+
+
+def drop_search_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {PROFILE_TABLE}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {POST_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mini_insta", "0011_post_profile_time_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_tables, drop_search_tables),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:26
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_celebrities(apps, schema_editor):
+    """Mark the profiles whose posts fan-out already skips for their follower count."""
+    Profile = apps.get_model("mini_insta", "Profile")
+    limit = getattr(settings, "MINI_INSTA_FANOUT_LIMIT", 1000)
+    Profile.objects.filter(num_followers__gt=limit).update(
+        celebrity_since=timezone.now()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("mini_insta", "0012_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="celebrity_since",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(mark_celebrities, migrations.RunPython.noop),
+    ]
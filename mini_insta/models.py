@@ -16,6 +16,14 @@ class Profile(models.Model):
     join_date = models.TextField(blank=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True)
 
+    # denormalized counters, kept current by the views that write and repaired by reconcile_counters
+    num_posts = models.IntegerField(default=0)
+    num_followers = models.IntegerField(default=0)
+    num_following = models.IntegerField(default=0)
+
+    # when the profile passed MINI_INSTA_FANOUT_LIMIT followers; until it falls back, its posts aren't fanned out
+    celebrity_since = models.DateTimeField(null=True, blank=True)
+
     def __str__(self):
         ''' return string representation of profile instance '''
         return f'{self.username}, {self.display_name}'
@@ -26,7 +34,7 @@ class Profile(models.Model):
     
     def get_all_posts(self):
         ''' return QuerySet of posts associated with this profile '''
-        posts = Post.objects.filter(profile=self).order_by('-timestamp')
+        posts = Post.objects.filter(profile=self).order_by('-timestamp', '-pk')
         return posts
     
     def get_num_posts(self):
@@ -83,6 +91,15 @@ class Post(models.Model):
     timestamp = models.DateTimeField(blank=True)
     caption = models.TextField(blank=True)
 
+    # denormalized counter, kept current by the like views and repaired by reconcile_counters
+    num_likes = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # a profile's posts newest first, for the post grid and celebrity feeds
+            models.Index(fields=['profile', '-timestamp', '-id'], name='post_profile_time_idx'),
+        ]
+
     def __str__(self):
         ''' return string representation of post '''
         return f'USERNAME: {self.profile.username}; TIMESTAMP: {self.timestamp}'
@@ -163,4 +180,27 @@ class Like(models.Model):
 
     def __str__(self):
         ''' return string representation of a like '''
-        return f'LIKE BY: {self.profile.username}'
\ No newline at end of file
+        return f'LIKE BY: {self.profile.username}'
+
+class TimelineEntry(models.Model):
+    ''' a post delivered to the feed of one profile, written when the post or the follow is created '''
+
+    owner = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="timeline")
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="timeline_entries")
+    author = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name="+", db_index=False)
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # a feed is one range scan of this index, newest first
+            models.Index(fields=['owner', '-timestamp', '-post'], name='timeline_owner_time_idx'),
+            # unfollowing removes one author's posts from one feed
+            models.Index(fields=['owner', 'author'], name='timeline_owner_author_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'post'], name='timeline_owner_post_uniq'),
+        ]
+
+    def __str__(self):
+        ''' return string representation of a timeline entry '''
+        return f'FEED OF: {self.owner.username}; POST: {self.post_id} BY: {self.author.username}'
@@ -0,0 +1,59 @@
+# File: pagination.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: cursor pagination of posts, newest first, seeking on (timestamp, id) instead of using OFFSET
+
+import base64
+from datetime import datetime
+from django.db.models import Q
+
+
+def encode_cursor(timestamp, pk):
+    ''' return an opaque token for the (timestamp, id) of the last post on a page '''
+    raw = f'{timestamp.isoformat()}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    ''' return (timestamp, id) for a token, or None if the token is empty or not a valid cursor '''
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        timestamp, pk = raw.split('|')
+        return datetime.fromisoformat(timestamp), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def seek_before(before, timestamp='timestamp', pk='pk'):
+    ''' build the condition for rows older than a decoded cursor, on the given timestamp and id fields '''
+    ts, last = before
+    return Q(**{f'{timestamp}__lt': ts}) | Q(**{timestamp: ts, f'{pk}__lt': last})
+
+
+def posts_before(posts, before):
+    ''' return posts ordered newest first, after the cursor position when one is given '''
+    if before is not None:
+        posts = posts.filter(seek_before(before))
+    return posts.order_by('-timestamp', '-pk')
+
+
+class CursorPage:
+    ''' one page of posts and the token for the next page, None on the last page '''
+
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def cursor_page(posts, per_page):
+    ''' return the first per_page posts of an ordered QuerySet as a CursorPage '''
+    # fetch one extra post to learn whether there is a further page
+    rows = list(posts[:per_page + 1])
+    if len(rows) <= per_page:
+        return CursorPage(rows, None)
+    rows = rows[:per_page]
+    return CursorPage(rows, encode_cursor(rows[-1].timestamp, rows[-1].pk))
@@ -0,0 +1,103 @@
+# File: search.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: SQLite FTS5 search over profile names and post captions, kept current as they change
+
+import re
+from django.db import connection
+from cs412.fts import SearchPage, page_of, search_enabled
+from .models import Post, Profile
+
+# FTS5 tables holding the searchable text of each profile and post, keyed by its id
+PROFILE_TABLE = 'mini_insta_profile_search'
+POST_TABLE = 'mini_insta_post_search'
+
+# results shown on each page of a search
+PROFILES_PER_PAGE = 12
+POSTS_PER_PAGE = 12
+
+
+def index_profile(profile):
+    ''' add or replace the search entry of a profile '''
+    if not search_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {PROFILE_TABLE} WHERE rowid = %s', [profile.pk])
+        cursor.execute(f'INSERT INTO {PROFILE_TABLE} (rowid, username, display_name) VALUES (%s, %s, %s)',
+                       [profile.pk, profile.username, profile.display_name])
+
+
+def index_post(post):
+    ''' add or replace the search entry of a post '''
+    if not search_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {POST_TABLE} WHERE rowid = %s', [post.pk])
+        cursor.execute(f'INSERT INTO {POST_TABLE} (rowid, caption) VALUES (%s, %s)', [post.pk, post.caption])
+
+
+def unindex_post(pk):
+    ''' remove the search entry of a deleted post '''
+    if not search_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {POST_TABLE} WHERE rowid = %s', [pk])
+
+
+def rebuild_search_index():
+    ''' refill both search tables from the Profile and Post tables, e.g. after edits made in the admin '''
+    if not search_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {PROFILE_TABLE}')
+        cursor.execute(f'INSERT INTO {PROFILE_TABLE} (rowid, username, display_name) '
+                       f'SELECT id, username, display_name FROM mini_insta_profile')
+        cursor.execute(f'DELETE FROM {POST_TABLE}')
+        cursor.execute(f'INSERT INTO {POST_TABLE} (rowid, caption) SELECT id, caption FROM mini_insta_post')
+
+
+def match_expression(query):
+    '''
+    Turn free text into an FTS5 query where every term must appear as the
+    start of some indexed text. Hashtags and mentions are searched without
+    their # or @, and a term split by punctuation, like a username such as
+    "beach_fan.22", must match as adjacent words, so "@beach_f" finds
+    beach_fan.22. Returns None if the text has no words.
+    '''
+    phrases = []
+    for term in query.split():
+        # the index splits on anything but letters and digits, so match the pieces in order
+        words = re.findall(r'[^\W_]+', term)
+        if words:
+            phrases.append('"' + ' '.join(words) + '"*')
+    return ' '.join(phrases) or None
+
+
+def ranked_ids(table, match, limit, offset):
+    ''' return the ids of the rows in a search table matching an FTS5 expression, best first '''
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT rowid FROM {table} WHERE {table} MATCH %s ORDER BY rank LIMIT %s OFFSET %s',
+                       [match, limit, offset])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search(table, queryset, query, page, per_page):
+    '''
+    Return the SearchPage of rows from queryset whose text in table best
+    matches query, an empty one when query has no words to match.
+    '''
+    match = match_expression(query)
+    if match is None or not search_enabled():
+        return SearchPage([], page, False)
+
+    ids = ranked_ids(table, match, per_page + 1, (page - 1) * per_page)
+    return page_of(queryset, ids, page, per_page)
+
+
+def search_profiles(query, page=1, per_page=PROFILES_PER_PAGE):
+    ''' return the SearchPage of profiles whose username or display name match query '''
+    return search(PROFILE_TABLE, Profile.objects.all(), query, page, per_page)
+
+
+def search_posts(query, page=1, per_page=POSTS_PER_PAGE, posts=None):
+    ''' return the SearchPage of posts whose caption matches query, loaded from the posts QuerySet if given '''
+    return search(POST_TABLE, Post.objects.all() if posts is None else posts, query, page, per_page)
@@ -2,6 +2,273 @@
 # Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 9/23/2025
 # Description: file to run test cases for mini_insta
 
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from .counters import reconcile_counters
+from .search import index_post, index_profile, search_posts, search_profiles
+from .timelines import backfill_timeline, fan_out_post, prune_timeline, rebuild_timelines, settle_follow, timeline_posts
+from .models import Comment, Follow, Like, Photo, Post, Profile, TimelineEntry
 
-# Create your tests here.
+
+class PostFeedQueryTests(TestCase):
+    ''' the post feed renders in the same number of queries however many posts it shows '''
+
+    # session, user, viewer profile, followed celebrities, feed posts and first photos
+    FEED_QUERIES = 6
+
+    def setUp(self):
+        self.user = User.objects.create_user('viewer', password='pw')
+        self.viewer = Profile.objects.create(username='viewer', user=self.user)
+        self.client.force_login(self.user)
+
+    def add_posts(self, count):
+        ''' add count posts by a newly followed profile, each with photos, likes and comments '''
+        now = timezone.now()
+        n = Profile.objects.count()
+        author = Profile.objects.create(username=f'author{n}', user=User.objects.create_user(f'author{n}'))
+        Follow.objects.create(profile=author, follower_profile=self.viewer, timestamp=now)
+
+        for i in range(count):
+            post = Post.objects.create(profile=author, timestamp=now, caption=f'post {i}')
+            Photo.objects.create(post=post, image_url=f'https://example.com/{post.pk}/1.jpg', timestamp=now)
+            Photo.objects.create(post=post, image_url=f'https://example.com/{post.pk}/2.jpg', timestamp=now)
+            Comment.objects.create(post=post, profile=author, timestamp=now, text='first')
+            Like.objects.create(post=post, profile=author, timestamp=now)
+            if i % 2:
+                Like.objects.create(post=post, profile=self.viewer, timestamp=now)
+        reconcile_counters()
+        rebuild_timelines()
+
+    def get_feed(self, name='post_feed', cursor=''):
+        with self.assertNumQueries(self.FEED_QUERIES):
+            response = self.client.get(reverse(name), {'cursor': cursor} if cursor else {})
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_feed_query_count_is_constant(self):
+        self.add_posts(2)
+        self.assertEqual(len(self.get_feed().context['posts']), 2)
+
+        self.add_posts(20)
+        self.assertEqual(len(self.get_feed().context['posts']), 10)
+
+    def test_feed_batches_by_cursor(self):
+        self.add_posts(12)
+        self.add_posts(13)
+        expected = [post.pk for post in self.viewer.get_post_feed().order_by('-timestamp', '-pk')]
+
+        first = self.get_feed().context['cursor_page']
+        seen = [post.pk for post in first.object_list]
+        cursor = first.next_cursor
+        while cursor:
+            batch = self.get_feed('post_feed_data', cursor).json()
+            seen += [post['id'] for post in batch['posts']]
+            cursor = batch['next_cursor']
+        self.assertEqual(seen, expected)
+
+    def test_feed_annotations(self):
+        self.add_posts(2)
+        posts = {p.caption: p for p in self.get_feed().context['posts']}
+
+        self.assertEqual([p.num_likes for p in (posts['post 0'], posts['post 1'])], [1, 2])
+        self.assertEqual(posts['post 0'].num_comments, 1)
+        self.assertFalse(posts['post 0'].is_liked)
+        self.assertTrue(posts['post 1'].is_liked)
+        self.assertEqual(len(posts['post 0'].first_photos), 1)
+        self.assertTrue(posts['post 0'].first_photos[0].image_url.endswith('/1.jpg'))
+
+
+class CounterTests(TestCase):
+    ''' the views keep the denormalized counters current and reconcile_counters repairs drift '''
+
+    def setUp(self):
+        now = timezone.now()
+        self.user = User.objects.create_user('viewer', password='pw')
+        self.viewer = Profile.objects.create(username='viewer', user=self.user)
+        self.author = Profile.objects.create(username='author', user=User.objects.create_user('author'))
+        self.post = Post.objects.create(profile=self.author, timestamp=now, caption='hello')
+        reconcile_counters()
+        self.client.force_login(self.user)
+
+    def counts(self):
+        self.viewer.refresh_from_db()
+        self.author.refresh_from_db()
+        self.post.refresh_from_db()
+        return (self.author.num_posts, self.author.num_followers, self.viewer.num_following, self.post.num_likes)
+
+    def test_views_update_counters(self):
+        self.assertEqual(self.counts(), (1, 0, 0, 0))
+
+        self.client.get(reverse('follow_profile', args=[self.author.pk]))
+        self.client.get(reverse('follow_profile', args=[self.author.pk]))
+        self.client.get(reverse('like_post', args=[self.post.pk]))
+        self.assertEqual(self.counts(), (1, 1, 1, 1))
+
+        self.client.get(reverse('delete_follow', args=[self.author.pk]))
+        self.client.get(reverse('delete_follow', args=[self.author.pk]))
+        self.client.get(reverse('delete_like', args=[self.post.pk]))
+        self.assertEqual(self.counts(), (1, 0, 0, 0))
+
+        self.client.post(reverse('delete_post', args=[self.post.pk]))
+        self.author.refresh_from_db()
+        self.assertEqual(self.author.num_posts, 0)
+
+    def test_reconcile_repairs_drift(self):
+        Follow.objects.create(profile=self.author, follower_profile=self.viewer, timestamp=timezone.now())
+        Profile.objects.filter(pk=self.author.pk).update(num_posts=7)
+
+        repaired = reconcile_counters()
+        self.assertEqual(repaired['profile.num_posts'], 1)
+        self.assertEqual(repaired['profile.num_followers'], 1)
+        self.assertEqual(self.counts(), (1, 1, 1, 0))
+        self.assertFalse(any(reconcile_counters(dry_run=True).values()))
+
+
+class TimelineTests(TestCase):
+    ''' feeds read from the fan-out timelines match the followed profiles' posts '''
+
+    def setUp(self):
+        self.viewer = Profile.objects.create(username='viewer')
+        self.author = Profile.objects.create(username='author')
+        self.other = Profile.objects.create(username='other')
+        self.old_post = self.add_post(self.author)
+
+    def add_post(self, profile):
+        post = Post.objects.create(profile=profile, timestamp=timezone.now(), caption=profile.username)
+        fan_out_post(post)
+        return post
+
+    def follow(self, follower, profile):
+        Follow.objects.create(profile=profile, follower_profile=follower, timestamp=timezone.now())
+        reconcile_counters()
+        profile.refresh_from_db()
+        backfill_timeline(follower, profile)
+        settle_follow(profile)
+
+    def test_follow_post_and_unfollow(self):
+        self.follow(self.viewer, self.author)
+        new_post = self.add_post(self.author)
+        self.add_post(self.other)
+        self.assertEqual(list(timeline_posts(self.viewer)), [new_post, self.old_post])
+        self.assertEqual(list(timeline_posts(self.viewer)), list(self.viewer.get_post_feed()))
+
+        prune_timeline(self.viewer, self.author)
+        self.assertEqual(list(timeline_posts(self.viewer)), [])
+
+        new_post.delete()
+        self.assertFalse(TimelineEntry.objects.filter(post=new_post.pk).exists())
+
+    @override_settings(MINI_INSTA_FANOUT_LIMIT=1)
+    def test_celebrity_posts_are_read_at_feed_time(self):
+        self.follow(self.viewer, self.other)
+        self.follow(self.viewer, self.author)
+        self.follow(self.other, self.author)
+        celebrity_post = self.add_post(self.author)
+        other_post = self.add_post(self.other)
+
+        self.assertFalse(TimelineEntry.objects.filter(post=celebrity_post).exists())
+        self.assertEqual(list(timeline_posts(self.viewer)), [other_post, celebrity_post, self.old_post])
+        before = (other_post.timestamp, other_post.pk)
+        self.assertEqual(list(timeline_posts(self.viewer, before)), [celebrity_post, self.old_post])
+
+    @override_settings(MINI_INSTA_FANOUT_LIMIT=3)
+    def test_posts_made_as_celebrity_stay_after_unfollows(self):
+        fan, fourth = Profile.objects.create(username='fan'), Profile.objects.create(username='fourth')
+        for profile in (self.viewer, self.other, fan, fourth):
+            profile.user = User.objects.create_user(profile.username, password='pw')
+            profile.save()
+
+        def toggle(profile, name):
+            self.client.force_login(profile.user)
+            self.client.get(reverse(name, args=[self.author.pk]))
+
+        for profile in (self.viewer, self.other, fan, fourth):
+            toggle(profile, 'follow_profile')
+        self.author.refresh_from_db()
+        celebrity_post = self.add_post(self.author)
+        self.assertFalse(TimelineEntry.objects.filter(post=celebrity_post).exists())
+
+        # following and unfollowing around the limit leaves the author a celebrity
+        for _ in range(2):
+            toggle(fan, 'delete_follow')
+            toggle(fan, 'follow_profile')
+        self.assertFalse(TimelineEntry.objects.filter(post=celebrity_post).exists())
+
+        # down at the floor, the posts fan-out skipped are delivered: the new ones to
+        # the follower from before, and all of them to the one who followed since
+        toggle(self.other, 'delete_follow')
+        toggle(fourth, 'delete_follow')
+        self.author.refresh_from_db()
+        self.assertIsNone(self.author.celebrity_since)
+        for profile in (self.viewer, fan):
+            self.assertEqual(list(timeline_posts(profile)), [celebrity_post, self.old_post])
+        self.assertEqual(list(timeline_posts(self.other)), [])
+
+
+class SearchTests(TestCase):
+    ''' profile and post search reads ranked, paged results from the FTS index '''
+
+    def setUp(self):
+        self.user = User.objects.create_user('viewer', password='pw')
+        self.viewer = Profile.objects.create(username='viewer', display_name='Beach Fan', user=self.user)
+        index_profile(self.viewer)
+        self.client.force_login(self.user)
+
+    def add_post(self, caption):
+        post = Post.objects.create(profile=self.viewer, timestamp=timezone.now(), caption=caption)
+        index_post(post)
+        return post
+
+    def test_ranked_prefix_matches(self):
+        beach = self.add_post('sunny day at the beach, beach volleyball and beach towels')
+        once = self.add_post('a quiet beach walk')
+        self.add_post('mountain hike')
+
+        self.assertEqual(search_posts('bea').object_list, [beach, once])
+        self.assertEqual(search_posts('sun bea').object_list, [beach])
+        self.assertEqual(search_posts('!!').object_list, [])
+        self.assertEqual(search_profiles('fan').object_list, [self.viewer])
+        self.assertEqual(search_profiles('view').object_list, [self.viewer])
+
+    def test_usernames_and_hashtags(self):
+        self.viewer.username = 'beach_fan.22'
+        self.viewer.save()
+        index_profile(self.viewer)
+        post = self.add_post('sunset at the pier #beachlife')
+
+        self.assertEqual(search_profiles('@beach_f').object_list, [self.viewer])
+        self.assertEqual(search_profiles('fan.2').object_list, [self.viewer])
+        self.assertEqual(search_profiles('fan_beach').object_list, [])
+        self.assertEqual(search_posts('#beach').object_list, [post])
+
+    def test_query_without_words_shows_no_results(self):
+        self.add_post('beach day')
+        for query in ('', '  ', '#@!'):
+            response = self.client.get(reverse('search'), {'query': query})
+            self.assertFalse(response.context['searchable'])
+            self.assertEqual(list(response.context['posts']), [])
+            self.assertEqual(response.context['profiles_page'].object_list, [])
+            self.assertContains(response, 'Enter a word')
+
+    def test_paging(self):
+        for i in range(5):
+            self.add_post(f'beach {i}')
+        first = search_posts('beach', 1, per_page=3)
+        second = search_posts('beach', 2, per_page=3)
+        self.assertTrue(first.has_next())
+        self.assertFalse(second.has_next())
+        self.assertEqual(len({p.pk for p in first.object_list + second.object_list}), 5)
+
+    def test_views_keep_index_current(self):
+        post = self.add_post('beach day')
+        self.client.post(reverse('update_post', args=[post.pk]), {'caption': 'snow day'})
+        self.assertEqual(search_posts('beach').object_list, [])
+        self.assertEqual(search_posts('snow').object_list, [post])
+
+        response = self.client.get(reverse('search'), {'query': 'snow'})
+        self.assertEqual(list(response.context['posts']), [post])
+
+        self.client.post(reverse('delete_post', args=[post.pk]))
+        self.assertEqual(search_posts('snow').object_list, [])
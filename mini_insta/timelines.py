@@ -0,0 +1,162 @@
+# File: timelines.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: fan-out-on-write timelines, so a feed is read from one table instead of every followed profile's posts
+
+from itertools import islice
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import Follow, Post, Profile, TimelineEntry
+from .pagination import posts_before, seek_before
+
+
+def fanout_limit():
+    ''' profiles with more followers than this are merged into feeds at read time instead of fanned out '''
+    return getattr(settings, 'MINI_INSTA_FANOUT_LIMIT', 1000)
+
+
+def fanout_floor():
+    '''
+    a celebrity goes back to fan-out only once its followers fall to this,
+    so follows and unfollows around the limit don't keep switching it
+    '''
+    return fanout_limit() * 9 // 10
+
+
+def is_celebrity(profile):
+    ''' whether posts by this profile skip fan-out and are read from the posts table '''
+    return profile.celebrity_since is not None
+
+
+def followers_of(profile):
+    ''' return the pks of the profiles whose feed shows this profile's posts '''
+    follows = Follow.objects.filter(profile=profile).exclude(follower_profile__username=profile.username)
+    return follows.values_list('follower_profile', flat=True).distinct()
+
+
+def write_entries(entries, batch_size=1000):
+    ''' insert an iterable of timeline entries in batches, skipping any a feed already has, and return how many were given '''
+    entries = iter(entries)
+    written = 0
+    while True:
+        batch = list(islice(entries, batch_size))
+        if not batch:
+            return written
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        written += len(batch)
+
+
+def fan_out_post(post):
+    ''' deliver a new post to the timeline of every follower of its author, unless the author is a celebrity '''
+    if is_celebrity(post.profile):
+        return 0
+    return write_entries([
+        TimelineEntry(owner_id=owner, post=post, author_id=post.profile_id, timestamp=post.timestamp)
+        for owner in followers_of(post.profile)
+    ])
+
+
+def backfill_timeline(owner, author):
+    ''' add the existing posts of a newly followed profile to the follower's timeline '''
+    if owner.username == author.username or is_celebrity(author):
+        return 0
+    posts = Post.objects.filter(profile=author).values_list('pk', 'timestamp')
+    return write_entries([
+        TimelineEntry(owner=owner, post_id=pk, author=author, timestamp=timestamp)
+        for pk, timestamp in posts
+    ])
+
+
+def deliver(owners, posts, author, batch_size=1000):
+    ''' write each of a QuerySet of (pk, timestamp) posts by author to the timeline of each owner '''
+    return write_entries((
+        TimelineEntry(owner_id=owner, post_id=pk, author=author, timestamp=timestamp)
+        for owner in owners for pk, timestamp in posts.iterator(chunk_size=batch_size)
+    ), batch_size)
+
+
+def fan_out_author(author, batch_size=1000):
+    ''' deliver every post of a profile to the timeline of each of its followers '''
+    posts = Post.objects.filter(profile=author).values_list('pk', 'timestamp')
+    return deliver(list(followers_of(author)), posts, author, batch_size)
+
+
+def settle_follow(author):
+    ''' start merging a profile's posts into feeds at read time once a follow takes it past the fan-out limit '''
+    if is_celebrity(author) or author.num_followers <= fanout_limit():
+        return
+    author.celebrity_since = timezone.now()
+    Profile.objects.filter(pk=author.pk).update(celebrity_since=author.celebrity_since)
+
+
+def settle_unfollow(author, batch_size=1000):
+    '''
+    Once unfollows bring a celebrity down to the fan-out floor, deliver
+    what fan-out skipped while it was one: the posts it made since, to the
+    followers from before, and all its posts to those who followed since.
+    Its feeds then stop merging in its posts at read time. Returns the
+    number of entries written.
+    '''
+    if not is_celebrity(author) or author.num_followers > fanout_floor():
+        return 0
+
+    since = author.celebrity_since
+    follows = Follow.objects.filter(profile=author).exclude(follower_profile__username=author.username)
+    earlier = set(follows.filter(timestamp__lt=since).values_list('follower_profile', flat=True))
+    later = set(follows.filter(timestamp__gte=since).values_list('follower_profile', flat=True)) - earlier
+
+    posts = Post.objects.filter(profile=author).values_list('pk', 'timestamp')
+    written = deliver(earlier, posts.filter(timestamp__gte=since), author, batch_size)
+    written += deliver(later, posts, author, batch_size)
+
+    author.celebrity_since = None
+    Profile.objects.filter(pk=author.pk).update(celebrity_since=None)
+    return written
+
+
+def prune_timeline(owner, author):
+    ''' remove the posts of an unfollowed profile from the follower's timeline '''
+    deleted, _ = TimelineEntry.objects.filter(owner=owner, author=author).delete()
+    return deleted
+
+
+def timeline_posts(profile, before=None):
+    '''
+    Return the feed of a profile as a QuerySet of posts, newest first and
+    older than the decoded cursor before, if given. Posts fanned out to the
+    profile's timeline are read with one range scan of the timeline index;
+    posts by followed celebrities, which were not fanned out, are merged in
+    from the posts table.
+    '''
+    celebrities = list(profile.get_following().filter(celebrity_since__isnull=False).values_list('pk', flat=True))
+    if not celebrities:
+        # entries copy the post's timestamp, so seeking and ordering on them avoids a sort;
+        # the conditions go in one filter() so they share the join to the timeline
+        condition = Q(timeline_entries__owner=profile)
+        if before is not None:
+            condition &= seek_before(before, 'timeline_entries__timestamp', 'timeline_entries__post')
+        posts = Post.objects.filter(condition)
+        return posts.order_by('-timeline_entries__timestamp', '-timeline_entries__post')
+
+    delivered = TimelineEntry.objects.filter(owner=profile).values('post')
+    return posts_before(Post.objects.filter(Q(pk__in=delivered) | Q(profile__in=celebrities)), before)
+
+
+def rebuild_timelines(batch_size=1000):
+    '''
+    Rebuild every timeline from the follows and posts, e.g. after changing
+    MINI_INSTA_FANOUT_LIMIT, marking the profiles over the limit as
+    celebrities. Returns the number of entries written.
+    '''
+    written = 0
+    with transaction.atomic():
+        limit = fanout_limit()
+        Profile.objects.filter(num_followers__gt=limit, celebrity_since=None).update(celebrity_since=timezone.now())
+        Profile.objects.filter(num_followers__lte=limit).update(celebrity_since=None)
+
+        TimelineEntry.objects.all().delete()
+        followed = Follow.objects.values('profile')
+        for author in Profile.objects.filter(pk__in=followed, celebrity_since=None).iterator():
+            written += fan_out_author(author, batch_size)
+    return written
@@ -8,6 +8,7 @@ from .views import ProfileListView, ProfileDetailView, PostDetailView, CreatePos
 from .views import UpdateProfileView, DeletePostView, UpdatePostView, ShowFollowerDetailView
 from .views import ShowFollowingDetailView, PostFeedListView, SearchView, LogoutConfirmationView
 from .views import CreateProfileView, FollowProfileView, DeleteFollowView, LikePostView, DeleteLikeView
+from .views import PostFeedDataView, ProfilePostsDataView
 
 urlpatterns = [
     # profiles
@@ -16,10 +17,12 @@ urlpatterns = [
     path('profile/<int:pk>', ProfileDetailView.as_view(), name='profile'),
     path('profile/<int:pk>/followers', ShowFollowerDetailView.as_view(), name='show_followers'),
     path('profile/<int:pk>/following', ShowFollowingDetailView.as_view(), name='show_following'),
+    path('profile/<int:pk>/posts', ProfilePostsDataView.as_view(), name='profile_posts_data'),
     path('profile/create_post', CreatePostView.as_view(), name="create_post"),
     path('profile/update', UpdateProfileView.as_view(), name="update_profile"),
     path('profile/search', SearchView.as_view(), name="search"),
     path('profile/feed', PostFeedListView.as_view(), name='post_feed'),
+    path('profile/feed/data', PostFeedDataView.as_view(), name='post_feed_data'),
 
     # posting
     path('post/<int:pk>', PostDetailView.as_view(), name='post'),
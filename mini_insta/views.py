@@ -3,6 +3,7 @@
 # Description: logic/backend for mini_insta
 
 from django.utils import timezone
+from django.db import transaction
 from django.shortcuts import render, redirect
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, TemplateView
 from django.urls import reverse
@@ -10,7 +11,14 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth import login
 from django.contrib.auth.forms import UserCreationForm
 from django.shortcuts import get_object_or_404
+from django.http import JsonResponse
+from cs412.fts import SearchPage, page_number
 from .models import Photo, Profile, Post, Follow, Like
+from .counters import adjust_counters
+from .feed import feed_data, grid_data, with_feed_data, with_first_photo
+from .pagination import cursor_page, decode_cursor, posts_before
+from .search import index_post, index_profile, match_expression, search_posts, search_profiles, unindex_post
+from .timelines import backfill_timeline, fan_out_post, prune_timeline, settle_follow, settle_unfollow, timeline_posts
 from .forms import CreatePostForm, UpdateProfileForm, UpdatePostForm, CreateProfileForm
 
 # Create your views here.
@@ -40,7 +48,10 @@ class  CreateProfileView(CreateView):
             user = user_form.save()
             login(self.request, user, backend='django.contrib.auth.backends.ModelBackend')
             form.instance.user = user
-        return super().form_valid(form)
+        with transaction.atomic():
+            response = super().form_valid(form)
+            index_profile(self.object)
+        return response
     
 
 class ProfileDetailView(DetailView):
@@ -49,10 +60,17 @@ class ProfileDetailView(DetailView):
     template_name = "show_profile.html"
     context_object_name = "profile"
 
+    # posts in each batch of the post grid
+    per_page = 24
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         profile_to_view = self.object
 
+        # one batch of the post grid, from the position in ?cursor=
+        posts = posts_before(profile_to_view.get_all_posts(), decode_cursor(self.request.GET.get('cursor')))
+        context['posts_page'] = cursor_page(with_first_photo(posts), self.per_page)
+
         # Add flags for the logged-in user if authenticated
         if self.request.user.is_authenticated:
             is_following = profile_to_view.is_followed_by_user(self.request.user)
@@ -112,18 +130,23 @@ class CreatePostView(LoginRequiredMixin, CreateView):
         
         form.instance.profile = profile
         form.instance.timestamp = timezone.now()
-        post = form.save()
 
-        # create photo object and assign all the image files to it
-        image_files = self.request.FILES.getlist('image_file')
-        while image_files:
-            Photo.objects.create(
-                post=post,
-                image_file=image_files.pop(),
-                timestamp=timezone.now()
-            )
+        with transaction.atomic():
+            post = form.save()
+            adjust_counters(Profile, profile.pk, num_posts=1)
+            fan_out_post(post)
+            index_post(post)
+
+            # create photo object and assign all the image files to it
+            image_files = self.request.FILES.getlist('image_file')
+            while image_files:
+                Photo.objects.create(
+                    post=post,
+                    image_file=image_files.pop(),
+                    timestamp=timezone.now()
+                )
 
-        return super().form_valid(form)
+            return super().form_valid(form)
 
     def get_success_url(self):
         '''Provide a URL to redirect to after creating a new Comment.'''
@@ -148,6 +171,13 @@ class UpdateProfileView(LoginRequiredMixin, UpdateView):
         ''' get profile object for this user '''
         return get_object_or_404(Profile, user=self.request.user)
 
+    def form_valid(self, form):
+        ''' save the profile and refresh its search entry '''
+        with transaction.atomic():
+            response = super().form_valid(form)
+            index_profile(self.object)
+        return response
+
 class DeletePostView(LoginRequiredMixin, DeleteView):
     ''' view class to delete posts '''
     model = Post
@@ -165,6 +195,15 @@ class DeletePostView(LoginRequiredMixin, DeleteView):
         context['profile'] = post.profile
         return context
 
+    def form_valid(self, form):
+        ''' delete the post, with its timeline entries and search entry, and take it off its profile's post count '''
+        pk = self.object.pk
+        with transaction.atomic():
+            response = super().form_valid(form)
+            adjust_counters(Profile, self.object.profile_id, num_posts=-1)
+            unindex_post(pk)
+        return response
+
     def get_success_url(self):
         ''' return url page of when post is successfully deleted '''
         post = self.get_object()
@@ -188,6 +227,13 @@ class UpdatePostView(LoginRequiredMixin, UpdateView):
         context['profile'] = post.profile
         return context
 
+    def form_valid(self, form):
+        ''' save the post and refresh its search entry '''
+        with transaction.atomic():
+            response = super().form_valid(form)
+            index_post(self.object)
+        return response
+
     def get_success_url(self):
         ''' return url page of when post is successfully submitted '''
         post = self.get_object()
@@ -226,27 +272,46 @@ class PostFeedListView(LoginRequiredMixin, ListView):
     template_name = "show_feed.html"
     context_object_name = "posts"
 
+    # posts in each batch of the feed
+    per_page = 10
+
     # authentication
     login_url = "/login/"
 
     def get_queryset(self):
-        '''Return the post feed for the profile matching the pk in the URL.'''
-        profile = Profile.objects.get(user=self.request.user)
-        return profile.get_post_feed()
+        '''Return the timeline of the logged-in profile from ?cursor=, annotated with counts and its like status.'''
+        self.profile = Profile.objects.select_related('user').get(user=self.request.user)
+        before = decode_cursor(self.request.GET.get('cursor'))
+        return with_feed_data(timeline_posts(self.profile, before), viewer=self.profile)
 
     def get_context_data(self, **kwargs):
-        '''Add profile info and is_liked status to the template context.'''
+        '''Add profile info and one batch of posts to the template context.'''
         context = super().get_context_data(**kwargs)
-        profile = Profile.objects.get(user=self.request.user)
-        context['profile'] = profile
-        
-        # Iterate over all posts to check the like status for the logged-in user
-        if self.request.user.is_authenticated:
-            for post in context['posts']:
-                post.is_liked = post.is_liked_by_user(self.request.user)
-        
+        context['profile'] = self.profile
+        context['cursor_page'] = cursor_page(self.object_list, self.per_page)
+        context['posts'] = context['cursor_page'].object_list
         return context
 
+class PostFeedDataView(PostFeedListView):
+    ''' return one batch of the post feed as JSON, for loading more posts as the page scrolls '''
+
+    def render_to_response(self, context, **response_kwargs):
+        page = context['cursor_page']
+        return JsonResponse({
+            'posts': [feed_data(post, self.request.user) for post in page.object_list],
+            'next_cursor': page.next_cursor,
+        })
+
+class ProfilePostsDataView(ProfileDetailView):
+    ''' return one batch of a profile's post grid as JSON '''
+
+    def render_to_response(self, context, **response_kwargs):
+        page = context['posts_page']
+        return JsonResponse({
+            'posts': [grid_data(post) for post in page.object_list],
+            'next_cursor': page.next_cursor,
+        })
+
 class SearchView(LoginRequiredMixin, ListView):
     ''' View class to search Profiles and Posts based on a text input. '''
     
@@ -265,14 +330,19 @@ class SearchView(LoginRequiredMixin, ListView):
         return super().dispatch(request, *args, **kwargs)
 
     def get_queryset(self):
-        ''' Returns the QuerySet of matching Posts. 
-        This is what the ListView mechanism expects. '''
+        ''' Returns one page of the best matching Posts from the search index.
+        This is what the ListView mechanism expects. A query with no words,
+        e.g. empty or only punctuation, matches nothing rather than everything. '''
         query = self.request.GET.get('query', '')
-        posts = Post.objects.filter(caption__icontains=query).order_by('-timestamp')
-        return posts
-    
+        self.searchable = match_expression(query) is not None
+        if not self.searchable:
+            self.posts_page = SearchPage([], 1, False)
+        else:
+            self.posts_page = search_posts(query, page_number(self.request.GET), posts=with_feed_data(Post.objects.all()))
+        return self.posts_page.object_list
+
     def get_context_data(self, **kwargs):
-        ''' processing logic to filter out searches '''
+        ''' add the matching profiles and pages of results to the context '''
         context = super().get_context_data(**kwargs)
 
         profile = Profile.objects.get(user=self.request.user)
@@ -281,21 +351,16 @@ class SearchView(LoginRequiredMixin, ListView):
         context['profile'] = profile
         context['query'] = query
         
+        context['searchable'] = self.searchable
         context['posts'] = self.object_list
-        
-        profiles_results = []
-        lower_query = query.lower()
-
-        # for loop to compare search text with username, display_name, and         
-        for p in Profile.objects.all():
-
-            username_match = lower_query in p.username.lower() if p.username else False
-            display_name_match = lower_query in p.display_name.lower() if p.display_name else False
-            
-            if username_match or display_name_match:
-                profiles_results.append(p)
-
-        context['profiles_results'] = profiles_results
+        context['posts_page'] = self.posts_page
+
+        # profiles ranked by how well their username and display name match
+        if not self.searchable:
+            context['profiles_page'] = SearchPage([], 1, False)
+        else:
+            context['profiles_page'] = search_profiles(query, page_number(self.request.GET))
+        context['profiles_results'] = context['profiles_page'].object_list
         
         return context
     
@@ -325,12 +390,18 @@ class FollowProfileView(LoginRequiredMixin, TemplateView):
             ).exists()
 
             if not existing_follow:
-                # Create the Follow object
-                Follow.objects.create(
-                    profile=profile_to_follow,
-                    follower_profile=follower_profile,
-                    timestamp=timezone.now()
-                )
+                # Create the Follow object and count it on both profiles
+                with transaction.atomic():
+                    Follow.objects.create(
+                        profile=profile_to_follow,
+                        follower_profile=follower_profile,
+                        timestamp=timezone.now()
+                    )
+                    adjust_counters(Profile, profile_to_follow.pk, num_followers=1)
+                    adjust_counters(Profile, follower_profile.pk, num_following=1)
+                    backfill_timeline(follower_profile, profile_to_follow)
+                    profile_to_follow.refresh_from_db(fields=['num_followers'])
+                    settle_follow(profile_to_follow)
 
         return redirect('profile', pk=profile_to_follow.pk)
 
@@ -347,11 +418,18 @@ class DeleteFollowView(LoginRequiredMixin, TemplateView):
         profile_to_unfollow = get_object_or_404(Profile, pk=kwargs['pk'])
         follower_profile = get_object_or_404(Profile, user=request.user)
 
-        # Find and delete the Follow object
-        Follow.objects.filter(
-            profile=profile_to_unfollow,
-            follower_profile=follower_profile
-        ).delete()
+        # Find and delete the Follow object, uncounting it only if one existed
+        with transaction.atomic():
+            deleted, _ = Follow.objects.filter(
+                profile=profile_to_unfollow,
+                follower_profile=follower_profile
+            ).delete()
+            if deleted:
+                adjust_counters(Profile, profile_to_unfollow.pk, num_followers=-1)
+                adjust_counters(Profile, follower_profile.pk, num_following=-1)
+                prune_timeline(follower_profile, profile_to_unfollow)
+                profile_to_unfollow.refresh_from_db(fields=['num_followers'])
+                settle_unfollow(profile_to_unfollow)
         
         # Redirect back to the profile page of the person who was unfollowed
         return redirect('profile', pk=profile_to_unfollow.pk)
@@ -377,12 +455,14 @@ class LikePostView(LoginRequiredMixin, TemplateView):
             ).exists()
             
             if not existing_like:
-                # Create the Like object
-                Like.objects.create(
-                    post=post,
-                    profile=liking_profile,
-                    timestamp=timezone.now()
-                )
+                # Create the Like object and count it on the post
+                with transaction.atomic():
+                    Like.objects.create(
+                        post=post,
+                        profile=liking_profile,
+                        timestamp=timezone.now()
+                    )
+                    adjust_counters(Post, post.pk, num_likes=1)
         
         # Redirect back to the post's detail page
         return redirect('post', pk=post.pk)
@@ -402,10 +482,13 @@ class DeleteLikeView(LoginRequiredMixin, TemplateView):
         liking_profile = get_object_or_404(Profile, user=request.user)
 
         # Find and delete the Like object
-        Like.objects.filter(
-            post=post,
-            profile=liking_profile
-        ).delete()
+        with transaction.atomic():
+            deleted, _ = Like.objects.filter(
+                post=post,
+                profile=liking_profile
+            ).delete()
+            if deleted:
+                adjust_counters(Post, post.pk, num_likes=-deleted)
         
         # Redirect back to the post's detail page
         return redirect('post', pk=post.pk)
\ No newline at end of file
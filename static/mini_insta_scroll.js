@@ -0,0 +1,39 @@
+// File: mini_insta_scroll.js
+// Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+// Description: infinite scroll shared by the feed and profile pages, loading the next batch of posts as JSON
+
+// Replace the "load more" link `more` with batches fetched from its data-url
+// as it comes into view, appending render(post) to `list` for each post.
+// The link keeps its data-cursor and href pointing at the next batch, so it
+// still works as a plain link without javascript.
+function infiniteScroll(more, list, render) {
+    if (!more) return;
+    let loading = false;
+
+    async function loadMore() {
+        if (loading || !more.dataset.cursor) return;
+        loading = true;
+        try {
+            const response = await fetch(more.dataset.url + "?cursor=" + encodeURIComponent(more.dataset.cursor));
+            if (!response.ok) throw new Error("loading posts failed: " + response.status);
+            const batch = await response.json();
+            batch.posts.forEach(post => list.append(render(post)));
+            if (batch.next_cursor) {
+                more.dataset.cursor = batch.next_cursor;
+                more.href = "?cursor=" + batch.next_cursor;
+            } else {
+                more.remove();
+                observer.disconnect();
+            }
+        } finally {
+            // a failed fetch must not stop the next scroll from trying again
+            loading = false;
+        }
+    }
+
+    // fetch the next batch when the end of the list comes into view
+    const observer = new IntersectionObserver(entries => {
+        if (entries.some(entry => entry.isIntersecting)) loadMore();
+    });
+    observer.observe(more);
+}
@@ -0,0 +1,237 @@
+# File: analytics.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: shared voter filtering and database-side aggregation for voter_analytics views
+
+from datetime import date
+from django.conf import settings
+from django.db import models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import ExtractYear
+from .models import Dataset
+
+elections = ['v20state', 'v21town', 'v21primary', 'v22general', 'v23town']
+
+# dimensions that voters can be grouped by, mapped to the expression to group on
+DIMENSIONS = {
+    'birth_year': ExtractYear('date_of_birth'),
+    'party_affiliation': 'party_affiliation',
+    'voter_score': 'voter_score',
+}
+
+
+def default_dataset():
+    ''' return the name of the dataset shown when none is chosen '''
+    return getattr(settings, 'VOTER_ANALYTICS_DATASET', 'newton')
+
+
+def to_int(value):
+    ''' return value as an int, or None if it is missing or not a number '''
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def clamp_year(year):
+    ''' return year limited to the years for which year_range can build January 1st of the next year '''
+    return min(max(year, date.min.year), date.max.year - 1)
+
+
+def parse_filters(params):
+    '''
+    Normalize the filter form in params (a QueryDict such as request.GET)
+    into a dict of the dataset, party, min/max year of birth, voter score
+    and the list of elections the voters must have taken part in.
+    '''
+    min_year = to_int(params.get('min_dob_year'))
+    max_year = to_int(params.get('max_dob_year'))
+
+    # the year range only applies when both ends are chosen
+    if min_year is None or max_year is None:
+        min_year = max_year = None
+    else:
+        # keep both ends where the range can be turned into dates; years outside it hold no voters anyway
+        min_year = clamp_year(min_year)
+        max_year = clamp_year(max_year)
+
+    return {
+        'dataset': params.get('dataset') or default_dataset(),
+        'party': params.get('party') or None,
+        'min_dob_year': min_year,
+        'max_dob_year': max_year,
+        'voter_score': to_int(params.get('voter_score')),
+        'elections': [e for e in elections if params.get(e) == 'on'],
+    }
+
+
+def year_range(queryset, field, min_year, max_year):
+    '''
+    Filter field to the years min_year through max_year. Date fields are
+    compared against a half-open date range so the database can use an
+    index on the column instead of extracting the year from every row.
+    '''
+    if isinstance(queryset.model._meta.get_field(field), models.DateField):
+        return queryset.filter(**{
+            f'{field}__gte': date(min_year, 1, 1),
+            f'{field}__lt': date(max_year + 1, 1, 1),
+        })
+    return queryset.filter(**{f'{field}__range': [min_year, max_year]})
+
+
+def coded_field(model, name):
+    ''' return (code field, lookup model) if name is stored as a code on model, else None '''
+    return getattr(model, 'CODED_FIELDS', {}).get(name)
+
+
+def filter_value(queryset, name, value):
+    ''' filter name == value, comparing codes when the model stores name as a code '''
+    coded = coded_field(queryset.model, name)
+    if coded is None:
+        return queryset.filter(**{name: value})
+
+    code_field, lookup = coded
+    code = lookup.encode(value)
+    if code is None:  # no voter has this value
+        return queryset.none()
+    return queryset.filter(**{f'{code_field}_id': code})
+
+
+def filter_dataset(queryset, dataset):
+    ''' restrict a QuerySet of a model with a dataset field to the named dataset '''
+    code = Dataset.encode(dataset)
+    if code is None:  # nothing has been loaded under this name
+        return queryset.none()
+    return queryset.filter(dataset_id=code)
+
+
+def apply_filters(queryset, filters, year_field):
+    ''' apply parsed filters to a QuerySet, using year_field for the year of birth range '''
+
+    # Every query is scoped to one dataset, which leads each index
+    queryset = filter_dataset(queryset, filters['dataset'])
+
+    # Filter by party
+    if filters['party']:
+        queryset = filter_value(queryset, 'party_affiliation', filters['party'])
+
+    # Filter by min and max year of birth
+    if filters['min_dob_year'] is not None:
+        queryset = year_range(queryset, year_field, filters['min_dob_year'], filters['max_dob_year'])
+
+    # Filter by voter score
+    if filters['voter_score'] is not None:
+        queryset = queryset.filter(voter_score=filters['voter_score'])
+
+    # Filter by previous election participation; Django writes "= True" as the bare
+    # column, which SQLite cannot look up in an index, so compare with IN instead
+    for election in filters['elections']:
+        queryset = queryset.filter(**{f'{election}__in': [True]})
+
+    return queryset
+
+
+def filter_voters(voters, params):
+    ''' apply the filter form in params to a Voter QuerySet '''
+    return apply_filters(voters, parse_filters(params), 'date_of_birth')
+
+
+def dimension(model, name):
+    ''' return what to group on for a dimension: the model field if it has one, else an expression '''
+    field_names = {f.name for f in model._meta.get_fields()}
+    field_names |= {f.attname for f in model._meta.concrete_fields}
+    return name if name in field_names else DIMENSIONS[name]
+
+
+def grouped_counts(queryset, dimensions, weight=None):
+    '''
+    Count rows grouped by the named dimensions in a single GROUP BY query.
+    Each returned row holds the dimension values, the voter count 'n' and the
+    number of those voters who took part in each election that is not itself
+    a dimension. With weight set, each row counts as the value of that field
+    instead of as one voter. Coded dimensions are grouped on their code and
+    decoded afterwards.
+    '''
+    group_by = {}
+    fields = []
+    decoders = {}
+    for name in dimensions:
+        coded = coded_field(queryset.model, name)
+        if coded is not None:
+            code_field, lookup = coded
+            fields.append(f'{code_field}_id')
+            decoders[name] = (f'{code_field}_id', lookup)
+            continue
+
+        expression = dimension(queryset.model, name)
+        if isinstance(expression, str):
+            fields.append(expression)
+        else:
+            group_by[name] = expression
+            fields.append(name)
+
+    # elections that are grouped on are already part of each row
+    flags = [e for e in elections if e not in dimensions]
+    if weight:
+        n = Sum(weight, default=0)
+        flag_counts = {e: Sum(weight, filter=Q(**{e: True}), default=0) for e in flags}
+    else:
+        n = Count('pk')
+        flag_counts = {e: Count('pk', filter=Q(**{e: True})) for e in flags}
+
+    rows = (queryset.order_by()
+                    .annotate(**group_by)
+                    .values(*fields)
+                    .annotate(n=n, **flag_counts))
+
+    for row in rows:
+        for name, (code_field, lookup) in decoders.items():
+            row[name] = lookup.decode(row.pop(code_field))
+        yield row
+
+
+class VoterSummary:
+    ''' totals needed by the voter charts, folded from grouped count rows '''
+
+    def __init__(self):
+        self.total = 0
+        self.birth_years = {}
+        self.parties = {}
+        self.elections = {e: 0 for e in elections}
+
+    def add(self, row):
+        ''' fold one grouped count row into this summary '''
+        n = row['n']
+        self.total += n
+
+        year = row.get('birth_year')
+        if year is not None:
+            self.birth_years[year] = self.birth_years.get(year, 0) + n
+
+        party = row.get('party_affiliation')
+        if party:
+            self.parties[party] = self.parties.get(party, 0) + n
+
+        for e in elections:
+            self.elections[e] += row[e]
+
+    def birth_year_series(self):
+        ''' return (years, counts) sorted by year '''
+        years = sorted(self.birth_years)
+        return years, [self.birth_years[y] for y in years]
+
+    def party_series(self):
+        ''' return (parties, counts) with the largest party first '''
+        parties = sorted(self.parties, key=self.parties.get, reverse=True)
+        return parties, [self.parties[p] for p in parties]
+
+    def election_series(self):
+        ''' return (elections, counts) in election order '''
+        return list(elections), [self.elections[e] for e in elections]
+
+
+def summarize_voters(queryset, weight=None):
+    ''' compute the chart totals for a QuerySet with one aggregate query '''
+    summary = VoterSummary()
+    for row in grouped_counts(queryset, ['birth_year', 'party_affiliation'], weight):
+        summary.add(row)
+    return summary
@@ -0,0 +1,64 @@
+# File: benchmarks.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: helpers shared by the voter_analytics benchmark commands
+
+import time
+from itertools import combinations
+from django.db.models import Count
+from django.http import QueryDict
+from .analytics import elections
+from .models import Party, Voter
+
+
+def sample_params():
+    ''' pick realistic values for each filter on the voter pages from the data '''
+    party_code = (Voter.objects.values('party').annotate(n=Count('pk'))
+                  .order_by('-n').values_list('party', flat=True).first())
+    party = Party.decode(party_code) or 'D'
+    score = (Voter.objects.values('voter_score').annotate(n=Count('pk'))
+             .order_by('-n').values_list('voter_score', flat=True).first()) or 0
+    return {
+        'party': {'party': party},
+        'dob': {'min_dob_year': '1950', 'max_dob_year': '1970'},
+        'score': {'voter_score': str(score)},
+    }
+
+
+def filter_combinations():
+    ''' yield (label, params) for every combination of the voter filter form '''
+    samples = sample_params()
+    groups = list(samples) + ['election']
+
+    for size in range(len(groups) + 1):
+        for combo in combinations(groups, size):
+            params = QueryDict(mutable=True)
+            for group in combo:
+                if group == 'election':
+                    params[elections[0]] = 'on'
+                else:
+                    params.update(samples[group])
+            yield (' + '.join(combo) or 'no filters'), params
+
+    # each election checkbox on its own
+    for election in elections[1:]:
+        params = QueryDict(mutable=True)
+        params[election] = 'on'
+        yield election, params
+
+
+def best_time(fn, repeat):
+    ''' return the fastest of repeat runs of fn in milliseconds '''
+    best = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def percentile(samples, pct):
+    ''' return the pct-th percentile of samples by nearest rank '''
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
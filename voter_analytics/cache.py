@@ -0,0 +1,61 @@
+# File: cache.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: cache of voter chart payloads, invalidated by a data version
+
+import hashlib
+import json
+from django.core.cache import caches
+from django.db.models import F
+from .analytics import parse_filters
+from .models import DataVersion
+
+# name of the cache configured in settings.CACHES for chart payloads
+CHART_CACHE = 'voter_charts'
+
+# prefix of the DataVersion row each voter import bumps, one per dataset
+VOTER_DATA = 'voters'
+
+
+def filter_fingerprint(params):
+    ''' return a stable hash of the normalized filters in params '''
+    filters = json.dumps(parse_filters(params), sort_keys=True)
+    return hashlib.sha1(filters.encode()).hexdigest()
+
+
+def voter_data(dataset):
+    ''' return the name of the DataVersion row of a voter dataset '''
+    return f'{VOTER_DATA}:{dataset}'
+
+
+def data_version(name):
+    ''' return the current version of the named data '''
+    version = DataVersion.objects.filter(name=name).values_list('version', flat=True).first()
+    return version or 0
+
+
+def bump_data_version(name):
+    ''' mark the named data as changed so results cached for older versions are never read again '''
+    if not DataVersion.objects.filter(name=name).update(version=F('version') + 1):
+        DataVersion.objects.create(name=name, version=1)
+
+
+def cached_payload(key, build, dataset):
+    '''
+    Return the payload cached under key for the current version of a voter
+    dataset, calling build() only when it is missing. Loading one dataset
+    leaves the cached results of the others valid; entries for older
+    versions are no longer looked up and age out of the LRU cache.
+    '''
+    cache = caches[CHART_CACHE]
+    key = f'{dataset}:{key}:{data_version(voter_data(dataset))}'
+
+    payload = cache.get(key)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload)
+    return payload
+
+
+def cached_charts(params, build):
+    ''' return the chart payload for the filters in params, calling build() only when it is not cached '''
+    return cached_payload(f'charts:{filter_fingerprint(params)}', build, parse_filters(params)['dataset'])
@@ -0,0 +1,89 @@
+# File: charts.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: builds compact Plotly figure JSON for the voter graphs page
+
+import hashlib
+import json
+from functools import lru_cache
+import plotly.graph_objects as go
+import plotly.io as pio
+import plotly.offline as opy
+
+
+@lru_cache(maxsize=1)
+def plotly_js():
+    ''' return (source, fingerprint) of the plotly.js bundle shipped with the plotly package '''
+    source = opy.get_plotlyjs()
+    fingerprint = hashlib.sha256(source.encode()).hexdigest()[:16]
+    return source, fingerprint
+
+
+def figure_json(fig):
+    ''' return the data and layout of a figure as plain JSON types, without the shared template '''
+    figure = json.loads(pio.to_json(fig, validate=False))
+    figure['layout'].pop('template', None)
+    return figure
+
+
+@lru_cache(maxsize=1)
+def layout_template():
+    ''' return the default Plotly layout template, sent once per page for all charts '''
+    return json.loads(pio.to_json(go.Figure(), validate=False))['layout'].get('template', {})
+
+
+def build_charts(summary):
+    '''
+    Return the payload for the voter graphs page from a VoterSummary: the
+    shared layout template and the figure JSON of each chart by name.
+    '''
+    charts = {}
+
+    # Histogram (Bar Chart): Distribution of Voters by Year of Birth
+    x_birth, y_birth = summary.birth_year_series()
+    fig = go.Figure(data=[go.Bar(x=x_birth, y=y_birth)],
+                    layout={"title": {"text": "Distribution of Voters by Year of Birth"},
+                            "xaxis": {"title": {"text": "Year of Birth"}},
+                            "yaxis": {"title": {"text": "Number of Voters"}}})
+    charts['birth_year'] = figure_json(fig)
+
+    # Pie Chart: Distribution of Voters by Party Affiliation
+    x_party, y_party = summary.party_series()
+    fig = go.Figure(data=[go.Pie(labels=x_party, values=y_party)],
+                    layout={"title": {"text": "Voter Party Affiliation Distribution"}})
+    charts['party'] = figure_json(fig)
+
+    # Histogram (Bar Chart): Distribution of Voters by Election Participation
+    x_elections, y_elections = summary.election_series()
+    fig = go.Figure(data=[go.Bar(x=x_elections, y=y_elections)],
+                    layout={"title": {"text": "Voter Participation in Each Election"},
+                            "xaxis": {"title": {"text": "Election"}},
+                            "yaxis": {"title": {"text": "Number of Voters"}}})
+    charts['election_participation'] = figure_json(fig)
+
+    return {'template': layout_template(), 'charts': charts}
+
+
+def turnout_heatmap(payload, title):
+    ''' return the figure JSON of a heatmap of turnout percent, one row per area and one column per election '''
+    keys = [k for k in payload['rows'][0] if k not in ('voters', 'voted', 'turnout')] if payload['rows'] else []
+    labels = [' / '.join(row[k] for k in keys) for row in payload['rows']]
+    z = [[row['turnout'][e] for e in payload['elections']] for row in payload['rows']]
+    voters = [[row['voters']] * len(payload['elections']) for row in payload['rows']]
+
+    fig = go.Figure(data=[go.Heatmap(x=payload['elections'], y=labels, z=z, customdata=voters,
+                                     zmin=0, zmax=100, colorscale='Blues',
+                                     colorbar={"title": {"text": "Turnout %"}},
+                                     hovertemplate='%{y}, %{x}: %{z}% of %{customdata} voters<extra></extra>')],
+                    layout={"title": {"text": title},
+                            "xaxis": {"title": {"text": "Election"}},
+                            "yaxis": {"type": "category", "autorange": "reversed"},
+                            "height": max(400, 22 * len(labels) + 160)})
+    return figure_json(fig)
+
+
+def build_turnout_charts(precincts, zips):
+    ''' return the figure JSON of the precinct and zip code turnout heatmaps by name '''
+    return {
+        'precinct_turnout': turnout_heatmap(precincts, "Turnout by Precinct"),
+        'zip_turnout': turnout_heatmap(zips, "Turnout by Zip Code"),
+    }
@@ -0,0 +1,131 @@
+# File: columnar.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: optional in-process columnar snapshot of the Voter table for vectorized counts
+
+import threading
+from django.conf import settings
+from django.db.models.functions import ExtractYear
+from .analytics import VoterSummary, elections, filter_dataset, parse_filters
+from .cache import data_version, voter_data
+from .models import Party, Voter
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; without it the rollup tables answer every query
+    np = None
+
+# bit of each election in the packed flags column
+ELECTION_BITS = {e: 1 << i for i, e in enumerate(elections)}
+
+
+class VoterColumns:
+    '''
+    NumPy arrays holding the filterable attributes of every voter in one
+    dataset: year of birth, voter score, party code and the five election
+    flags packed into one byte. Filters become boolean masks over these arrays.
+    '''
+
+    def __init__(self, birth_year, voter_score, party_code, flags, version=None):
+        self.birth_year = birth_year
+        self.voter_score = voter_score
+        self.party_code = party_code
+        self.flags = flags
+        self.version = version
+
+    def __len__(self):
+        return len(self.birth_year)
+
+    @classmethod
+    def from_db(cls, dataset, chunk_size=20000, version=None):
+        ''' load a snapshot of the voters of a dataset, streaming rows in chunks '''
+        rows = (filter_dataset(Voter.objects.all(), dataset).order_by()
+                .annotate(birth_year=ExtractYear('date_of_birth'))
+                .values_list('birth_year', 'voter_score', 'party_id', *elections)
+                .iterator(chunk_size=chunk_size))
+
+        years, scores, codes, flags = [], [], [], []
+        for year, score, party, *voted in rows:
+            years.append(year)
+            scores.append(score)
+            codes.append(party)
+            flags.append(sum(bit for bit, v in zip(ELECTION_BITS.values(), voted) if v))
+
+        return cls(
+            np.array(years, dtype=np.int16),
+            np.array(scores, dtype=np.int8),
+            np.array(codes, dtype=np.int32),
+            np.array(flags, dtype=np.uint8),
+            version,
+        )
+
+    def mask(self, filters):
+        ''' return a boolean array selecting the voters that match parsed filters '''
+        mask = np.ones(len(self), dtype=bool)
+
+        if filters['party']:
+            code = Party.encode(filters['party'])
+            if code is None:
+                return np.zeros(len(self), dtype=bool)
+            mask &= self.party_code == code
+
+        if filters['min_dob_year'] is not None:
+            mask &= (self.birth_year >= filters['min_dob_year']) & (self.birth_year <= filters['max_dob_year'])
+
+        if filters['voter_score'] is not None:
+            mask &= self.voter_score == filters['voter_score']
+
+        required = sum(ELECTION_BITS[e] for e in filters['elections'])
+        if required:
+            mask &= (self.flags & required) == required
+
+        return mask
+
+    def count(self, params):
+        ''' return the number of voters matching the filter form in params '''
+        return int(np.count_nonzero(self.mask(parse_filters(params))))
+
+    def summarize(self, params):
+        ''' compute the chart totals for the voters matching params '''
+        mask = self.mask(parse_filters(params))
+        summary = VoterSummary()
+        summary.total = int(np.count_nonzero(mask))
+        if not summary.total:
+            return summary
+
+        years, year_counts = np.unique(self.birth_year[mask], return_counts=True)
+        summary.birth_years = {int(y): int(n) for y, n in zip(years, year_counts)}
+
+        codes, party_counts = np.unique(self.party_code[mask], return_counts=True)
+        parties = {Party.decode(int(code)): int(n) for code, n in zip(codes, party_counts)}
+        summary.parties = {p: n for p, n in parties.items() if p}
+
+        flags = self.flags[mask]
+        summary.elections = {e: int(np.count_nonzero(flags & bit)) for e, bit in ELECTION_BITS.items()}
+        return summary
+
+
+# snapshot of each dataset loaded in this process, by dataset name
+_stores = {}
+_store_lock = threading.Lock()
+
+
+def columnar_enabled():
+    ''' the snapshot is used only when numpy is installed and the setting turns it on '''
+    return np is not None and getattr(settings, 'VOTER_ANALYTICS_COLUMNAR', False)
+
+
+def get_store(dataset):
+    '''
+    Return the columnar snapshot of a dataset for this process, reloading it
+    when the dataset's data version has changed since it was built. Returns
+    None when the columnar store is disabled.
+    '''
+    if not columnar_enabled():
+        return None
+
+    version = data_version(voter_data(dataset))
+    with _store_lock:
+        store = _stores.get(dataset)
+        if store is None or store.version != version:
+            store = _stores[dataset] = VoterColumns.from_db(dataset, version=version)
+        return store
@@ -0,0 +1,82 @@
+# File: facets.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: facet counts for the voter filter form, computed in one pass over the rollup table
+
+from collections import Counter
+from .analytics import elections, filter_dataset, parse_filters, to_int
+from .models import Dataset, VoterRollup
+
+
+def facet_counts(params):
+    '''
+    Count the voters behind each option of the filter form in params. Each
+    dropdown is counted under every other filter, so its counts show what
+    choosing that option would return; election counts are under all the
+    filters. All facets come from a single read of the matching rollup rows.
+    '''
+    filters = parse_filters(params)
+
+    # the dataset and election checkboxes narrow every facet, so they can be applied in the query
+    rollups = filter_dataset(VoterRollup.objects.all(), filters['dataset'])
+    rollups = rollups.filter(**{e: True for e in filters['elections']})
+    rows = rollups.values_list('party_affiliation', 'birth_year', 'voter_score', *elections, 'count')
+
+    parties, years, scores, voted = Counter(), Counter(), Counter(), Counter()
+    total = 0
+    for party, year, score, *flags, n in rows:
+        party_ok = not filters['party'] or party == filters['party']
+        year_ok = filters['min_dob_year'] is None or filters['min_dob_year'] <= year <= filters['max_dob_year']
+        score_ok = filters['voter_score'] is None or score == filters['voter_score']
+
+        if year_ok and score_ok and party:
+            parties[party] += n
+        if party_ok and score_ok:
+            years[year] += n
+        if party_ok and year_ok:
+            scores[score] += n
+        if party_ok and year_ok and score_ok:
+            total += n
+            for e, flag in zip(elections, flags):
+                if flag:
+                    voted[e] += n
+
+    return {
+        'total': total,
+        'party_affiliation': dict(parties),
+        'birth_year': dict(years),
+        'voter_score': dict(scores),
+        'elections': {e: voted[e] for e in elections},
+    }
+
+
+def options(counts, selected, order_by_count=False):
+    '''
+    Return the dropdown options for one facet as dicts of value, count and
+    whether it is selected. Options without voters are left out, except
+    the selected one.
+    '''
+    values = {v for v, n in counts.items() if n}
+    if selected is not None:
+        values.add(selected)
+    key = (lambda v: -counts.get(v, 0)) if order_by_count else None
+    return [{'value': v, 'count': counts.get(v, 0), 'selected': v == selected} for v in sorted(values, key=key)]
+
+
+def dataset_options(selected):
+    ''' return the options of the dataset dropdown: every dataset loaded '''
+    names = Dataset.objects.order_by('value').values_list('value', flat=True)
+    return [{'value': name, 'selected': name == selected} for name in names]
+
+
+def facet_options(counts, params):
+    ''' return template context for the filter form: options of each dropdown and the election checkboxes '''
+    return {
+        'datasets': dataset_options(parse_filters(params)['dataset']),
+        'parties': options(counts['party_affiliation'], params.get('party') or None, order_by_count=True),
+        'min_dob_years': options(counts['birth_year'], to_int(params.get('min_dob_year'))),
+        'max_dob_years': options(counts['birth_year'], to_int(params.get('max_dob_year'))),
+        'voter_scores': options(counts['voter_score'], to_int(params.get('voter_score'))),
+        'elections': [{'value': e, 'count': n, 'selected': params.get(e) == 'on'}
+                      for e, n in counts['elections'].items()],
+        'facet_total': counts['total'],
+    }
@@ -0,0 +1,49 @@
+# File: households.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: normalized household keys grouping the voters who live at the same address
+
+from django.db.models import Count
+
+
+def normalize(text):
+    ''' upper-case text and collapse punctuation and runs of spaces '''
+    for mark in '.,#':
+        text = text.replace(mark, ' ')
+    return ' '.join(text.upper().split())
+
+
+def household_key(street_number, street_name, apartment_number, zip_code):
+    '''
+    Return the key shared by every voter at one address: zip code, street,
+    house number and apartment, normalized so spelling differences in the
+    voter file do not split a household. House numbers are zero-padded so
+    keys sort in walking order along each street.
+    '''
+    number = normalize(street_number)
+    if number.isdigit():
+        number = number.zfill(6)
+
+    apartment = normalize(apartment_number)
+    for prefix in ('APT ', 'UNIT ', 'NO '):
+        if apartment.startswith(prefix):
+            apartment = apartment[len(prefix):]
+
+    return '|'.join([normalize(zip_code), normalize(street_name), number, apartment])
+
+
+def households(voters):
+    ''' group a Voter QuerySet by household, with the number of voters in each, ordered by key '''
+    return voters.order_by('household').values('household').annotate(n=Count('pk'))
+
+
+def count_households(voters):
+    ''' return the number of distinct households among a Voter QuerySet '''
+    return voters.order_by().values('household').distinct().count()
+
+
+def occupants(voters, keys):
+    ''' return {household key: [voters]} for the voters of a QuerySet living at the given households '''
+    result = {key: [] for key in keys}
+    for voter in voters.filter(household__in=keys).order_by('household', 'last_name', 'first_name', 'id'):
+        result[voter.household].append(voter)
+    return result
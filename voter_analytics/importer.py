@@ -0,0 +1,329 @@
+# File: importer.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: streaming CSV import of the town voter file into Voter records
+
+import csv
+import time
+from collections import Counter
+from multiprocessing import Pool
+from django.db import transaction
+from .analytics import default_dataset, filter_dataset
+from .households import household_key
+from .models import Dataset, Voter
+from .parsing import parse_chunk, read_chunks
+from .propensity import np, score_ids
+from .rollups import ROLLUP_KEY, apply_rollup_changes, rebuild_rollups, rollup_counts
+from .cache import bump_data_version, voter_data
+from .search import index_voters, rebuild_search_index, unindex_dataset, unindex_voters
+from .turnout import rebuild_turnout
+
+
+class ImportStats:
+    ''' running totals reported at the end of an import '''
+
+    def __init__(self):
+        self.created = 0
+        self.rejected = 0
+        self.errors = []
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def reject(self, rejected, max_errors):
+        ''' count rejected (row, error) pairs, keeping the first max_errors for the report '''
+        self.rejected += len(rejected)
+        for fields, error in rejected:
+            if len(self.errors) < max_errors:
+                self.errors.append((fields, error))
+
+    def finish(self):
+        ''' record the end of the import '''
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        ''' wall time of the import in seconds '''
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return end - self.started
+
+    @property
+    def rows_per_sec(self):
+        ''' rate of stored rows per second '''
+        return self.created / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        ''' return one-line summary of this import '''
+        return (f'Created {self.created} voters, rejected {self.rejected} rows '
+                f'in {self.elapsed:.2f}s ({self.rows_per_sec:,.0f} rows/sec)')
+
+
+def encode_batch(parsed):
+    ''' derive the household of parsed voters, then replace the text of coded fields with their lookup codes '''
+    for values in parsed:
+        values['household'] = household_key(values['street_number'], values['street_name'],
+                                            values['apartment_number'], values['zip_code'])
+
+    for name, (code_field, lookup) in Voter.CODED_FIELDS.items():
+        codes = lookup.encode_many(values[name] for values in parsed)
+        for values in parsed:
+            values[f'{code_field}_id'] = codes[values.pop(name)]
+
+
+def dataset_code(dataset):
+    ''' return the code of the named dataset, creating it the first time voters are loaded into it '''
+    return Dataset.encode_many([dataset])[dataset]
+
+
+def store_batch(parsed, batch_size, dataset):
+    ''' insert one batch of parsed voters into a dataset inside a single transaction '''
+    code = dataset_code(dataset)
+    # lookup codes are committed before the voters, so a failed batch can't leave cached codes behind
+    encode_batch(parsed)
+    with transaction.atomic():
+        Voter.objects.bulk_create([Voter(dataset_id=code, **values) for values in parsed], batch_size=batch_size)
+
+
+def existing_voter_ids(dataset):
+    ''' return the set of voter ids already stored in a dataset '''
+    voters = filter_dataset(Voter.objects.filter(voter_id__isnull=False), dataset)
+    return set(voters.values_list('voter_id', flat=True).iterator(chunk_size=20000))
+
+
+def drop_duplicates(parsed, seen):
+    '''
+    Split parsed voters into those to store and (row, error) pairs for the
+    ones whose voter id is in seen, adding the stored ids to seen. Voters
+    without an id are always stored.
+    '''
+    kept, duplicates = [], []
+    for values in parsed:
+        voter_id = values['voter_id']
+        if voter_id is None:
+            kept.append(values)
+        elif voter_id in seen:
+            duplicates.append(([voter_id], 'duplicate voter id'))
+        else:
+            seen.add(voter_id)
+            kept.append(values)
+    return kept, duplicates
+
+
+def clear_dataset(dataset):
+    ''' delete every voter of a dataset, and their search entries '''
+    with transaction.atomic():
+        unindex_dataset(dataset)
+        filter_dataset(Voter.objects.all(), dataset).delete()
+
+
+def refresh_derived_data(dataset):
+    ''' bring the tables computed from a dataset's voters up to date after an import '''
+    rebuild_rollups(dataset)
+    rebuild_turnout(dataset)
+    rebuild_search_index(dataset)
+    bump_data_version(voter_data(dataset))
+
+
+def parsed_batches(filename, batch_size, workers, stats, max_errors):
+    '''
+    Yield lists of parsed voter values from the voter file, batch_size rows
+    at a time, counting rejected rows in stats. With workers > 1 the parsing
+    runs in a process pool while the caller writes to the database.
+    '''
+    with open(filename, 'r', newline='') as f:
+        reader = csv.reader(f)
+        next(reader, None)  # discard headers
+        chunks = read_chunks(reader, batch_size)
+
+        pool = Pool(workers) if workers > 1 else None
+        try:
+            results = pool.imap(parse_chunk, chunks) if pool else map(parse_chunk, chunks)
+            for parsed, rejected in results:
+                stats.reject(rejected, max_errors)
+                if parsed:
+                    yield parsed
+        finally:
+            if pool:
+                pool.terminate()
+
+
+def import_voters(filename, dataset=None, batch_size=5000, workers=1, clear=False, max_errors=20):
+    '''
+    Stream the voter file at filename into a dataset (the default dataset
+    if None), leaving the voters of other datasets alone.
+
+    Rows are parsed in chunks of batch_size and each chunk is committed with
+    one bulk_create inside its own transaction. With workers > 1 the parsing
+    runs in a process pool while the main process writes to the database.
+    Rows whose voter id is already in the dataset, or earlier in the file,
+    are rejected rather than stored twice. The rollup, turnout and search
+    tables are refreshed once all rows are stored. Returns an ImportStats
+    with the totals.
+    '''
+    stats = ImportStats()
+    dataset = dataset or default_dataset()
+
+    if clear:
+        clear_dataset(dataset)
+    seen = existing_voter_ids(dataset)
+
+    for parsed in parsed_batches(filename, batch_size, workers, stats, max_errors):
+        parsed, duplicates = drop_duplicates(parsed, seen)
+        stats.reject(duplicates, max_errors)
+        if parsed:
+            store_batch(parsed, batch_size, dataset)
+        stats.created += len(parsed)
+
+    refresh_derived_data(dataset)
+    stats.finish()
+    return stats
+
+
+class DeltaStats(ImportStats):
+    ''' totals of a delta import: how the file differs from the database '''
+
+    def __init__(self):
+        super().__init__()
+        self.updated = 0
+        self.unchanged = 0
+        self.deleted = 0
+
+    @property
+    def changed(self):
+        ''' whether the import changed any voter '''
+        return bool(self.created or self.updated or self.deleted)
+
+    def __str__(self):
+        ''' return one-line summary of this import '''
+        return (f'Inserted {self.created}, updated {self.updated}, deleted {self.deleted}, '
+                f'unchanged {self.unchanged} voters, rejected {self.rejected} rows in {self.elapsed:.2f}s')
+
+
+def row_key(voter_id, row_hash):
+    ''' identify a voter by their voter id, or by the contents of their row if they have none '''
+    return voter_id or f'#{row_hash}'
+
+
+def rollup_key(values):
+    ''' return the rollup row parsed voter values count towards '''
+    attributes = dict(values, birth_year=values['date_of_birth'].year)
+    return tuple(attributes[k] for k in ROLLUP_KEY)
+
+
+def chunked(items, size=500):
+    ''' yield lists of at most size items, small enough for an IN (...) query '''
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def subtract_old_rollups(pks, rollup_changes):
+    ''' take the voters with these pks out of the pending rollup counts, before they change '''
+    for chunk in chunked(pks):
+        for key, n in rollup_counts(Voter.objects.filter(pk__in=chunk)).items():
+            rollup_changes[key] -= n
+
+
+def store_changes(new, changed, batch_size, rollup_changes):
+    '''
+    Insert new voters and overwrite changed ones (pairs of pk and values) in
+    one transaction, recording their effect on the rollups. Returns the pks
+    of every voter written.
+    '''
+    # a stored score was computed from the old voting history
+    for _, values in changed:
+        values['propensity'] = None
+
+    # rollup keys hold the text of the coded fields, so they are taken before encoding
+    keys = [rollup_key(values) for values in new + [values for _, values in changed]]
+    encode_batch(new + [values for _, values in changed])
+
+    with transaction.atomic():
+        subtract_old_rollups([pk for pk, _ in changed], rollup_changes)
+        for key in keys:
+            rollup_changes[key] += 1
+
+        created = Voter.objects.bulk_create([Voter(**values) for values in new], batch_size=batch_size)
+
+        updated = [Voter(pk=pk, **values) for pk, values in changed]
+        if updated:
+            fields = list(changed[0][1])
+            Voter.objects.bulk_update(updated, fields, batch_size=batch_size)
+
+    return [v.pk for v in created] + [v.pk for v in updated]
+
+
+def delete_voters(pks, rollup_changes):
+    ''' delete the voters with these pks, recording their effect on the rollups '''
+    with transaction.atomic():
+        subtract_old_rollups(pks, rollup_changes)
+        for chunk in chunked(pks):
+            Voter.objects.filter(pk__in=chunk).delete()
+
+
+def import_voter_changes(filename, dataset=None, batch_size=5000, workers=1, max_errors=20):
+    '''
+    Apply a new copy of the voter file to a dataset as a delta. Voters
+    are matched on their voter id (or the contents of their row when the
+    file has no id): new voters are inserted, voters whose row changed are
+    updated and voters missing from the file are deleted, in batched
+    transactions. Only the rollup rows, search entries and propensity
+    scores of those voters are touched (scores are cleared instead when
+    NumPy is missing); the small per-precinct turnout table is recomputed.
+    Returns a DeltaStats with the diff.
+    '''
+    stats = DeltaStats()
+    dataset = dataset or default_dataset()
+    code = dataset_code(dataset)
+
+    # every voter in the dataset, by key; whatever is left at the end was removed from the file
+    existing = {}
+    voters = filter_dataset(Voter.objects.all(), dataset)
+    for pk, voter_id, stored_hash in voters.values_list('pk', 'voter_id', 'row_hash').iterator(chunk_size=batch_size):
+        # voters stored before delta keys existed can't be matched, so they are replaced
+        key = row_key(voter_id, stored_hash) if voter_id or stored_hash else pk
+        existing[key] = (pk, stored_hash)
+
+    seen = set()
+    rollup_changes = Counter()
+    written = []
+
+    for parsed in parsed_batches(filename, batch_size, workers, stats, max_errors):
+        new, changed, duplicates = [], [], []
+        for values in parsed:
+            values['dataset_id'] = code
+            key = row_key(values['voter_id'], values['row_hash'])
+            if key in seen:
+                duplicates.append(([values['voter_id']], 'duplicate voter id'))
+                continue
+            seen.add(key)
+
+            found = existing.pop(key, None)
+            if found is None:
+                new.append(values)
+            elif found[1] != values['row_hash']:
+                changed.append((found[0], values))
+            else:
+                stats.unchanged += 1
+
+        stats.reject(duplicates, max_errors)
+        if new or changed:
+            written += store_changes(new, changed, batch_size, rollup_changes)
+        stats.created += len(new)
+        stats.updated += len(changed)
+
+    removed = [pk for pk, _ in existing.values()]
+    if removed:
+        delete_voters(removed, rollup_changes)
+    stats.deleted = len(removed)
+
+    # refresh only what the changed voters feed into
+    if stats.changed:
+        apply_rollup_changes(rollup_changes)
+        rebuild_turnout(dataset)
+        unindex_voters(written + removed)
+        index_voters(written)
+        if np is not None:
+            score_ids(written)
+        bump_data_version(voter_data(dataset))
+
+    stats.finish()
+    return stats
@@ -0,0 +1,49 @@
+# File: benchmark_columnar.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: management command comparing the ORM, rollup and columnar paths for voter counts and graphs
+
+from django.core.management.base import BaseCommand, CommandError
+from voter_analytics.analytics import default_dataset, filter_voters, summarize_voters
+from voter_analytics.benchmarks import best_time, filter_combinations
+from voter_analytics.columnar import VoterColumns, np
+from voter_analytics.models import Voter
+from voter_analytics.rollups import count_voters, summarize_rollups
+
+class Command(BaseCommand):
+    help = 'Times voter counts and graph totals from the ORM, the rollup table and the columnar snapshot'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='times to run each query; the best time is reported')
+        parser.add_argument('--dataset', default=default_dataset(), help='dataset to benchmark')
+
+    def handle(self, *args, **options):
+        if np is None:
+            raise CommandError('numpy is required for the columnar store')
+
+        repeat = options['repeat']
+        dataset = options['dataset']
+        load_ms = best_time(lambda: VoterColumns.from_db(dataset), 1)
+        store = VoterColumns.from_db(dataset)
+        self.stdout.write(f'Loaded {len(store)} voters into the columnar store in {load_ms:.0f}ms')
+
+        self.stdout.write(f"{'filters':<32}{'count: orm':>12}{'rollup':>10}{'columnar':>10}"
+                          f"{'graphs: orm':>14}{'rollup':>10}{'columnar':>10}")
+        for label, params in filter_combinations():
+            params['dataset'] = dataset
+            voters = filter_voters(Voter.objects.all(), params)
+
+            # every path must agree before its timing means anything
+            expected = voters.count()
+            if not expected == count_voters(params) == store.count(params):
+                raise CommandError(f'counts disagree for {label}')
+
+            timings = [
+                best_time(voters.count, repeat),
+                best_time(lambda: count_voters(params), repeat),
+                best_time(lambda: store.count(params), repeat),
+                best_time(lambda: summarize_voters(voters), repeat),
+                best_time(lambda: summarize_rollups(params), repeat),
+                best_time(lambda: store.summarize(params), repeat),
+            ]
+            self.stdout.write(f'{label:<32}' + ''.join(f'{t:>{w}.2f}' for t, w in zip(timings, [12, 10, 10, 14, 10, 10])))
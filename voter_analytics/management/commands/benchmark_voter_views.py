@@ -0,0 +1,99 @@
+# File: benchmark_voter_views.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: management command measuring latency, query counts and memory of the voter_analytics pages
+
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from django.core.cache import caches
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from voter_analytics.benchmarks import filter_combinations, percentile
+from voter_analytics.cache import CHART_CACHE
+from voter_analytics.models import Voter
+
+class Command(BaseCommand):
+    help = 'Requests the voter list, detail and graphs pages and reports latency percentiles, queries and peak memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help='requests per page and filter combination')
+        parser.add_argument('--cold', action='store_true', help='clear the chart cache before every request')
+        parser.add_argument('--output', metavar='PATH', help='save the results as JSON for comparing runs')
+
+    def measure(self, client, url, repeat, cold):
+        ''' request url repeat times, returning latency, query and memory figures '''
+        latencies = []
+        queries = []
+        for _ in range(repeat):
+            if cold:
+                caches[CHART_CACHE].clear()
+
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = client.get(url)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+            if response.status_code != 200:
+                raise CommandError(f'{url} returned {response.status_code}')
+            queries.append(len(captured))
+
+        # tracing allocations slows requests down, so memory is measured on a separate request
+        if cold:
+            caches[CHART_CACHE].clear()
+        tracemalloc.start()
+        client.get(url)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        return {
+            'url': url,
+            'p50_ms': round(percentile(latencies, 50), 2),
+            'p90_ms': round(percentile(latencies, 90), 2),
+            'p99_ms': round(percentile(latencies, 99), 2),
+            'max_ms': round(max(latencies), 2),
+            'queries': max(queries),
+            'peak_kb': round(peak / 1024, 1),
+        }
+
+    def pages(self):
+        ''' yield (view, filters, url) for every page and filter combination to measure '''
+        for label, params in filter_combinations():
+            query = f'?{params.urlencode()}' if params else ''
+            yield 'VoterListView', label, reverse('voter_list') + query
+            yield 'VoterGraphsView', label, reverse('graphs') + query
+
+        # a spread of voters for the detail page
+        rng = random.Random(0)
+        ids = list(Voter.objects.values_list('pk', flat=True)[:1000])
+        for pk in rng.sample(ids, min(5, len(ids))):
+            yield 'VoterDetailView', f'voter {pk}', reverse('voter_detail', kwargs={'pk': pk})
+
+    def handle(self, *args, **options):
+        total = Voter.objects.count()
+        if not total:
+            raise CommandError('no voters to benchmark; run generate_voters or import_voters first')
+
+        client = Client(HTTP_HOST='127.0.0.1')
+        results = []
+        for view, label, url in self.pages():
+            result = {'view': view, 'filters': label, **self.measure(client, url, options['repeat'], options['cold'])}
+            results.append(result)
+            self.stdout.write(f"{view:<16}{label:<32}p50 {result['p50_ms']:>8.2f}ms  p90 {result['p90_ms']:>8.2f}ms  "
+                              f"p99 {result['p99_ms']:>8.2f}ms  {result['queries']:>3} queries  {result['peak_kb']:>9.1f} KB")
+
+        if options['output']:
+            report = {
+                'run_at': datetime.now(timezone.utc).isoformat(),
+                'voters': total,
+                'repeat': options['repeat'],
+                'cold': options['cold'],
+                'results': results,
+            }
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Saved results to {options['output']}"))
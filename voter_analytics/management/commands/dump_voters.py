@@ -0,0 +1,31 @@
+# File: dump_voters.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: management command to write the voter dataset to a binary snapshot file
+
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from voter_analytics.snapshot import SnapshotError, dump_voters
+
+class Command(BaseCommand):
+    help = 'Writes voters, lookup tables, rollups and search text to a compact SQLite snapshot for restore_voters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='snapshot file to write')
+        parser.add_argument('--force', action='store_true', help='overwrite the file if it exists')
+
+    def handle(self, *args, **options):
+        if os.path.exists(options['path']) and not options['force']:
+            raise CommandError(f"{options['path']} already exists; use --force to overwrite it")
+
+        started = time.perf_counter()
+        try:
+            counts = dump_voters(options['path'])
+        except SnapshotError as e:
+            raise CommandError(str(e))
+
+        for name, rows in counts.items():
+            self.stdout.write(f'{name}: {rows} rows')
+        size = os.path.getsize(options['path']) / 1e6
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {options['path']} ({size:.1f} MB) in {time.perf_counter() - started:.2f}s"))
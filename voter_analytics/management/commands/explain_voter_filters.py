@@ -0,0 +1,57 @@
+# File: explain_voter_filters.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: management command to time the voter list filters and show their query plans
+
+import re
+from django.core.management.base import BaseCommand
+from django.db import connection
+from voter_analytics.analytics import filter_voters
+from voter_analytics.benchmarks import best_time, filter_combinations
+from voter_analytics.models import Voter
+from voter_analytics.views import list_voters
+
+# an index search narrowed by more than the dataset every query is scoped to
+NARROWED = re.compile(r'USING (COVERING )?INDEX \w+ \((?!dataset_id=\?\))')
+
+class Command(BaseCommand):
+    help = 'Runs every filter combination from show_all_voters.html and reports its timing and query plan'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--analyze', action='store_true',
+                            help='run ANALYZE first so the planner has table statistics')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='times to run each query; the best time is reported')
+
+    def handle(self, *args, **options):
+        if options['analyze']:
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        repeat = max(1, options['repeat'])
+        unindexed = []
+
+        for label, params in filter_combinations():
+            voters = filter_voters(Voter.objects.all(), params)
+            # the first page exactly as the voter list runs it, sorted by name
+            page = list_voters(params)[:100]
+
+            count_ms = best_time(voters.count, repeat)
+            page_ms = best_time(lambda: list(page.all()), repeat)
+            plan = voters.explain()
+
+            if params and not NARROWED.search(plan):
+                unindexed.append(label)
+
+            self.stdout.write(f'{label}: {voters.count()} rows, count {count_ms:.2f}ms, first page {page_ms:.2f}ms')
+            self.stdout.write('    filter:')
+            for line in plan.splitlines():
+                self.stdout.write(f'        {line}')
+            self.stdout.write('    first page:')
+            for line in page.explain().splitlines():
+                self.stdout.write(f'        {line}')
+
+        if unindexed:
+            # the planner may prefer a scan when a filter matches a large share of the table
+            self.stdout.write(self.style.WARNING(f"Full scans chosen by the planner: {', '.join(unindexed)}"))
+        else:
+            self.stdout.write(self.style.SUCCESS('Every filter narrows an index search'))
@@ -0,0 +1,68 @@
+# File: generate_voters.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: management command to fill the database (or a CSV file) with synthetic voters
+
+import csv
+from itertools import islice
+from django.core.management.base import BaseCommand, CommandError
+from voter_analytics.analytics import default_dataset, elections
+from voter_analytics.importer import ImportStats, clear_dataset, refresh_derived_data, store_batch
+from voter_analytics.synthetic import generate_voters
+
+# columns of the town voter file, in the order import_voters reads them
+CSV_FIELDS = [
+    'street_number', 'street_name', 'apartment_number', 'zip_code',
+    'date_of_birth', 'date_of_registration', 'party_affiliation', 'precinct_number',
+    *elections, 'voter_score',
+]
+
+class Command(BaseCommand):
+    help = 'Generates synthetic voters with realistic party, age and turnout distributions (e.g. 100000, 1000000, 10000000)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, help='number of voters to generate')
+        parser.add_argument('--seed', type=int, default=0, help='random seed, for repeatable data sets')
+        parser.add_argument('--batch-size', type=int, default=5000, help='rows per bulk insert')
+        parser.add_argument('--dataset', default=default_dataset(), help='dataset to fill with the voters')
+        parser.add_argument('--clear', action='store_true', help='delete the existing voters of the dataset first')
+        parser.add_argument('--csv', metavar='PATH',
+                            help='write a voter file for import_voters instead of filling the database')
+
+    def write_csv(self, path, voters):
+        ''' write voters to path in the layout of the town voter file '''
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Voter ID Number', 'Last Name', 'First Name'] + CSV_FIELDS)
+            for i, v in enumerate(voters):
+                flags = ['TRUE' if v[e] else 'FALSE' for e in elections]
+                writer.writerow([f'S{i:08d}', v['last_name'], v['first_name']]
+                                + [v[f] for f in CSV_FIELDS[:-6]] + flags + [v['voter_score']])
+
+    def handle(self, *args, **options):
+        if options['count'] < 1 or options['batch_size'] < 1:
+            raise CommandError('count and --batch-size must be at least 1')
+
+        stats = ImportStats()
+        voters = generate_voters(options['count'], seed=options['seed'])
+
+        if options['csv']:
+            self.write_csv(options['csv'], voters)
+            stats.finish()
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['count']} voters to {options['csv']} in {stats.elapsed:.2f}s"))
+            return
+
+        if options['clear']:
+            clear_dataset(options['dataset'])
+
+        while True:
+            batch = list(islice(voters, options['batch_size']))
+            if not batch:
+                break
+            store_batch(batch, options['batch_size'], options['dataset'])
+            stats.created += len(batch)
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{stats.created} voters stored')
+
+        refresh_derived_data(options['dataset'])
+        stats.finish()
+        self.stdout.write(self.style.SUCCESS(str(stats)))
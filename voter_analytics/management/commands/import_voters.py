@@ -0,0 +1,55 @@
+# File: import_voters.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: management command to bulk load the town voter file into Voter records
+
+from django.core.management.base import BaseCommand, CommandError
+from voter_analytics.analytics import default_dataset
+from voter_analytics.importer import import_voter_changes, import_voters
+
+class Command(BaseCommand):
+    help = 'Streams a voter CSV file into the database using batched bulk inserts'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='path to the voter CSV file')
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='rows per bulk insert and transaction (default 5000)')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='processes used to parse rows; use >1 for very large files')
+        parser.add_argument('--clear', action='store_true',
+                            help='delete the existing voters of the dataset before importing')
+        parser.add_argument('--dataset', default=default_dataset(),
+                            help='dataset (town and election cycle) to load the voters into')
+        parser.add_argument('--delta', action='store_true',
+                            help='apply the file as a delta: insert new, update changed and delete missing voters')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        if options['delta'] and options['clear']:
+            raise CommandError('--delta and --clear cannot be used together')
+
+        try:
+            if options['delta']:
+                stats = import_voter_changes(
+                    options['path'],
+                    dataset=options['dataset'],
+                    batch_size=options['batch_size'],
+                    workers=options['workers'],
+                )
+            else:
+                stats = import_voters(
+                    options['path'],
+                    dataset=options['dataset'],
+                    batch_size=options['batch_size'],
+                    workers=options['workers'],
+                    clear=options['clear'],
+                )
+        except FileNotFoundError:
+            raise CommandError(f"File not found: {options['path']}")
+
+        # show a sample of the rows that could not be stored
+        for fields, error in stats.errors:
+            self.stderr.write(f'Skipped record due to error: {error} with fields: {fields}')
+
+        self.stdout.write(self.style.SUCCESS(str(stats)))
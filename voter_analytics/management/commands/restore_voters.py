@@ -0,0 +1,26 @@
+# File: restore_voters.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: management command to replace the voter dataset with a snapshot written by dump_voters
+
+import time
+from django.core.management.base import BaseCommand, CommandError
+from voter_analytics.snapshot import SnapshotError, restore_voters
+
+class Command(BaseCommand):
+    help = 'Replaces voters, rollups and the search index with a snapshot written by dump_voters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='snapshot file to restore')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            counts = restore_voters(options['path'])
+        except FileNotFoundError:
+            raise CommandError(f"File not found: {options['path']}")
+        except SnapshotError as e:
+            raise CommandError(str(e))
+
+        for name, rows in counts.items():
+            self.stdout.write(f'{name}: {rows} rows')
+        self.stdout.write(self.style.SUCCESS(f'Restored voters in {time.perf_counter() - started:.2f}s'))
@@ -0,0 +1,23 @@
+# File: score_voters.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: management command to compute the turnout propensity of every voter
+
+from django.core.management.base import BaseCommand, CommandError
+from voter_analytics.propensity import np, score_voters
+
+class Command(BaseCommand):
+    help = 'Scores every voter with a turnout propensity weighted by recency, age and registration date'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=100000,
+                            help='voters scored and written per transaction (default 100000)')
+
+    def handle(self, *args, **options):
+        if np is None:
+            raise CommandError('numpy is required to score voters')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+
+        scored, elapsed = score_voters(options['chunk_size'])
+        rate = scored / elapsed if elapsed else 0.0
+        self.stdout.write(self.style.SUCCESS(f'Scored {scored} voters in {elapsed:.2f}s ({rate:,.0f} voters/sec)'))
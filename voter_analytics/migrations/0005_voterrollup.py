@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:23
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+
+ELECTIONS = ["v20state", "v21town", "v21primary", "v22general", "v23town"]
+
+
+def build_rollups(apps, schema_editor):
+    """Fill the rollup table from the voters already in the database."""
+    Voter = apps.get_model("voter_analytics", "Voter")
+    VoterRollup = apps.get_model("voter_analytics", "VoterRollup")
+
+    key = ["party_affiliation", "birth_year", "voter_score"] + ELECTIONS
+    rows = (
+        Voter.objects.order_by()
+        .annotate(birth_year=ExtractYear("date_of_birth"))
+        .values(*key)
+        .annotate(n=Count("pk"))
+    )
+    VoterRollup.objects.bulk_create(
+        [VoterRollup(count=row["n"], **{k: row[k] for k in key}) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0004_rename_party_affliation_voter_party_affiliation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="VoterRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("party_affiliation", models.TextField(blank=True)),
+                ("birth_year", models.IntegerField()),
+                ("voter_score", models.IntegerField(default=0)),
+                ("v20state", models.BooleanField(default=False)),
+                ("v21town", models.BooleanField(default=False)),
+                ("v21primary", models.BooleanField(default=False)),
+                ("v22general", models.BooleanField(default=False)),
+                ("v23town", models.BooleanField(default=False)),
+                ("count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0005_voterrollup"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["party_affiliation", "voter_score", "date_of_birth"],
+                name="voter_party_score_dob_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["voter_score", "date_of_birth"], name="voter_score_dob_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(fields=["date_of_birth"], name="voter_dob_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["v20state", "v21town", "v21primary", "v22general", "v23town"],
+                name="voter_elections_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(fields=["zip_code"], name="voter_zip_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(fields=["precinct_number"], name="voter_precinct_idx"),
+        ),
+    ]
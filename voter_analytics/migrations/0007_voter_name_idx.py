@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0006_voter_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["last_name", "first_name", "id"], name="voter_name_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,181 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# text column on Voter -> (new code column, lookup model)
+CODED_FIELDS = {
+    "party_affiliation": ("party", "Party"),
+    "zip_code": ("zip", "ZipCode"),
+    "precinct_number": ("precinct", "Precinct"),
+    "street_name": ("street", "StreetName"),
+}
+
+
+def encode_voters(apps, schema_editor):
+    """Fill the lookup tables and point every voter at its codes."""
+    Voter = apps.get_model("voter_analytics", "Voter")
+    for text_field, (code_field, model_name) in CODED_FIELDS.items():
+        Lookup = apps.get_model("voter_analytics", model_name)
+        values = Voter.objects.order_by().values_list(text_field, flat=True).distinct()
+        for value in values:
+            code = Lookup.objects.create(value=value)
+            Voter.objects.filter(**{text_field: value}).update(**{code_field: code})
+
+
+def decode_voters(apps, schema_editor):
+    """Copy the text of each code back onto the voters."""
+    Voter = apps.get_model("voter_analytics", "Voter")
+    for text_field, (code_field, model_name) in CODED_FIELDS.items():
+        Lookup = apps.get_model("voter_analytics", model_name)
+        for code in Lookup.objects.all():
+            Voter.objects.filter(**{code_field: code}).update(**{text_field: code.value})
+
+
+def lookup_model(name):
+    return migrations.CreateModel(
+        name=name,
+        fields=[
+            (
+                "id",
+                models.BigAutoField(
+                    auto_created=True,
+                    primary_key=True,
+                    serialize=False,
+                    verbose_name="ID",
+                ),
+            ),
+            ("value", models.TextField(unique=True)),
+        ],
+        options={
+            "abstract": False,
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0008_dataversion"),
+    ]
+
+    operations = [
+        lookup_model("Party"),
+        lookup_model("ZipCode"),
+        lookup_model("Precinct"),
+        lookup_model("StreetName"),
+        migrations.RemoveIndex(
+            model_name="voter",
+            name="voter_party_score_dob_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="voter",
+            name="voter_zip_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="voter",
+            name="voter_precinct_idx",
+        ),
+        migrations.AddField(
+            model_name="voter",
+            name="party",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.party",
+            ),
+        ),
+        migrations.AddField(
+            model_name="voter",
+            name="zip",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.zipcode",
+            ),
+        ),
+        migrations.AddField(
+            model_name="voter",
+            name="precinct",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.precinct",
+            ),
+        ),
+        migrations.AddField(
+            model_name="voter",
+            name="street",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.streetname",
+            ),
+        ),
+        migrations.RunPython(encode_voters, decode_voters),
+        migrations.RemoveField(
+            model_name="voter",
+            name="party_affiliation",
+        ),
+        migrations.RemoveField(
+            model_name="voter",
+            name="zip_code",
+        ),
+        migrations.RemoveField(
+            model_name="voter",
+            name="precinct_number",
+        ),
+        migrations.RemoveField(
+            model_name="voter",
+            name="street_name",
+        ),
+        migrations.AlterField(
+            model_name="voter",
+            name="party",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.party",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="voter",
+            name="zip",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.zipcode",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="voter",
+            name="precinct",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.precinct",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="voter",
+            name="street",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.streetname",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["party", "voter_score", "date_of_birth"],
+                name="voter_party_score_dob_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:40
+
+from django.db import migrations
+
+SEARCH_TABLE = "voter_analytics_voter_search"
+
+
+def create_search_table(apps, schema_editor):
+    """Create and fill the FTS5 table used for voter name and address search."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+        "last_name, first_name, street_name, zip_code, "
+        "prefix='1 2 3', tokenize='unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        f"INSERT INTO {SEARCH_TABLE} (rowid, last_name, first_name, street_name, zip_code) "
+        "SELECT v.id, v.last_name, v.first_name, s.value, z.value "
+        "FROM voter_analytics_voter v "
+        "JOIN voter_analytics_streetname s ON s.id = v.street_id "
+        "JOIN voter_analytics_zipcode z ON z.id = v.zip_id"
+    )
+
+
+def drop_search_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0009_coded_voter_fields"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0010_voter_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="voter",
+            name="row_hash",
+            field=models.CharField(blank=True, max_length=16),
+        ),
+        migrations.AddField(
+            model_name="voter",
+            name="voter_id",
+            field=models.TextField(blank=True, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:37
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+ELECTIONS = ["v20state", "v21town", "v21primary", "v22general", "v23town"]
+
+
+def build_turnout(apps, schema_editor):
+    """Fill the turnout table from the voters already in the database."""
+    Voter = apps.get_model("voter_analytics", "Voter")
+    PrecinctTurnout = apps.get_model("voter_analytics", "PrecinctTurnout")
+
+    rows = (
+        Voter.objects.order_by()
+        .values("precinct__value", "zip__value")
+        .annotate(
+            n=Count("pk"), **{e: Count("pk", filter=Q(**{e: True})) for e in ELECTIONS}
+        )
+    )
+    PrecinctTurnout.objects.bulk_create(
+        [
+            PrecinctTurnout(
+                precinct_number=row["precinct__value"],
+                zip_code=row["zip__value"],
+                voters=row["n"],
+                **{e: row[e] for e in ELECTIONS},
+            )
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0011_voter_delta_keys"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PrecinctTurnout",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("precinct_number", models.TextField(blank=True)),
+                ("zip_code", models.TextField(blank=True)),
+                ("voters", models.IntegerField(default=0)),
+                ("v20state", models.IntegerField(default=0)),
+                ("v21town", models.IntegerField(default=0)),
+                ("v21primary", models.IntegerField(default=0)),
+                ("v22general", models.IntegerField(default=0)),
+                ("v23town", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(build_turnout, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+def normalize(text):
+    for mark in ".,#":
+        text = text.replace(mark, " ")
+    return " ".join(text.upper().split())
+
+
+def household_key(street_number, street_name, apartment_number, zip_code):
+    """Same key as voter_analytics.households.household_key at the time of this migration."""
+    number = normalize(street_number)
+    if number.isdigit():
+        number = number.zfill(6)
+    apartment = normalize(apartment_number)
+    for prefix in ("APT ", "UNIT ", "NO "):
+        if apartment.startswith(prefix):
+            apartment = apartment[len(prefix) :]
+    return "|".join([normalize(zip_code), normalize(street_name), number, apartment])
+
+
+def fill_households(apps, schema_editor):
+    """Compute the household of the voters already in the database."""
+    Voter = apps.get_model("voter_analytics", "Voter")
+    rows = Voter.objects.values_list(
+        "pk", "street_number", "street__value", "apartment_number", "zip__value"
+    )
+
+    batch = []
+    for pk, number, street, apartment, zip_code in rows.iterator(chunk_size=5000):
+        batch.append(
+            Voter(pk=pk, household=household_key(number, street, apartment, zip_code))
+        )
+        if len(batch) == 5000:
+            Voter.objects.bulk_update(batch, ["household"])
+            batch = []
+    Voter.objects.bulk_update(batch, ["household"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0012_precinctturnout"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="voter",
+            name="household",
+            field=models.TextField(blank=True),
+        ),
+        migrations.RunPython(fill_households, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["household", "last_name", "first_name"],
+                name="voter_household_idx",
+            ),
+        ),
+    ]
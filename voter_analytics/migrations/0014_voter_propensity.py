@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0013_voter_household"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="voter",
+            name="propensity",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["propensity", "id"], name="voter_propensity_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,196 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# dataset the voters loaded before datasets existed are put in
+DEFAULT_DATASET = "newton"
+
+
+def assign_default_dataset(apps, schema_editor):
+    """Put every existing voter, rollup and turnout row in the default dataset."""
+    Dataset = apps.get_model("voter_analytics", "Dataset")
+    dataset, _ = Dataset.objects.get_or_create(value=DEFAULT_DATASET)
+    for model in ["Voter", "VoterRollup", "PrecinctTurnout"]:
+        apps.get_model("voter_analytics", model).objects.update(dataset=dataset)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("voter_analytics", "0014_voter_propensity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Dataset",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("value", models.TextField(unique=True)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name="voter",
+            name="voter_score_dob_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="voter",
+            name="voter_dob_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="voter",
+            name="voter_elections_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="voter",
+            name="voter_name_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="voter",
+            name="voter_party_score_dob_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="voter",
+            name="voter_household_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="voter",
+            name="voter_propensity_idx",
+        ),
+        migrations.AlterField(
+            model_name="voter",
+            name="voter_id",
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="precinctturnout",
+            name="dataset",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.dataset",
+            ),
+        ),
+        migrations.AddField(
+            model_name="voter",
+            name="dataset",
+            field=models.ForeignKey(
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.dataset",
+            ),
+        ),
+        migrations.AddField(
+            model_name="voterrollup",
+            name="dataset",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.dataset",
+            ),
+        ),
+        migrations.RunPython(assign_default_dataset, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="precinctturnout",
+            name="dataset",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.dataset",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="voter",
+            name="dataset",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.dataset",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="voterrollup",
+            name="dataset",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="voter_analytics.dataset",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["dataset", "party", "voter_score", "date_of_birth"],
+                name="voter_party_score_dob_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["dataset", "voter_score", "date_of_birth"],
+                name="voter_score_dob_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["dataset", "date_of_birth"], name="voter_dob_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=[
+                    "dataset",
+                    "v20state",
+                    "v21town",
+                    "v21primary",
+                    "v22general",
+                    "v23town",
+                ],
+                name="voter_elections_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["dataset", "last_name", "first_name", "id"],
+                name="voter_name_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["dataset", "household", "last_name", "first_name"],
+                name="voter_household_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="voter",
+            index=models.Index(
+                fields=["dataset", "propensity", "id"], name="voter_propensity_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="voter",
+            constraint=models.UniqueConstraint(
+                fields=("dataset", "voter_id"), name="voter_dataset_voter_id_uniq"
+            ),
+        ),
+    ]
@@ -2,31 +2,119 @@
 # Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/28/2025
 # Description: contains models for voter analytics webapp
 
-import csv
-from datetime import datetime
 from django.db import models
 
 # Create your models here.
+class CodedValue(models.Model):
+    '''
+    Lookup table giving each distinct text value a small integer code, so
+    voters store the code instead of repeating the text on every row.
+    Codes are never reused, so each process keeps a copy of the table and
+    only reloads it when it meets a code or value it has not seen, or when
+    codes it created were rolled back.
+    '''
+
+    value = models.TextField(unique=True)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        ''' return the text this code stands for '''
+        return self.value
+
+    @classmethod
+    def load(cls):
+        ''' reload this process's copy of the lookup table '''
+        cls._values = dict(cls.objects.values_list('pk', 'value'))
+        cls._codes = {v: pk for pk, v in cls._values.items()}
+
+    @classmethod
+    def decode(cls, code):
+        ''' return the text value for a code '''
+        if code is None:
+            return ''
+        if code not in cls.__dict__.get('_values', {}):
+            cls.load()
+        return cls._values.get(code, '')
+
+    @classmethod
+    def encode(cls, value):
+        ''' return the code for a text value, or None if no voter has that value '''
+        if value not in cls.__dict__.get('_codes', {}):
+            cls.load()
+        return cls._codes.get(value)
+
+    @classmethod
+    def encode_many(cls, values):
+        ''' return a dict of codes for values, creating codes for values not seen before '''
+        values = set(values)
+        # codes created in a transaction that was rolled back are gone; reread the table if any are
+        known = {cls.encode(v): v for v in values}
+        known.pop(None, None)
+        if dict(cls.objects.filter(pk__in=known).values_list('pk', 'value')) != known:
+            cls.load()
+        missing = [v for v in values if cls.encode(v) is None]
+        if missing:
+            cls.objects.bulk_create([cls(value=v) for v in missing], ignore_conflicts=True)
+            cls.load()
+        return {v: cls._codes[v] for v in values}
+
+
+class Party(CodedValue):
+    ''' party affiliation codes '''
+
+class ZipCode(CodedValue):
+    ''' residential zip codes '''
+
+class Precinct(CodedValue):
+    ''' voting precincts '''
+
+class StreetName(CodedValue):
+    ''' residential street names '''
+
+class Dataset(CodedValue):
+    ''' voter rolls loaded side by side, e.g. one per town and election cycle '''
+
+
 class Voter(models.Model):
     ''' structure of each voter's data attributes '''
 
+    # text fields stored as codes into a lookup table: name -> (code field, lookup model)
+    CODED_FIELDS = {
+        'party_affiliation': ('party', Party),
+        'zip_code': ('zip', ZipCode),
+        'precinct_number': ('precinct', Precinct),
+        'street_name': ('street', StreetName),
+    }
+
+    # voter roll this voter belongs to; leads every index so queries stay within one roll
+    dataset = models.ForeignKey(Dataset, on_delete=models.PROTECT, related_name='+', db_index=False)
+
+    # id from the town's voter file and a hash of the voter's row, used by delta imports
+    voter_id = models.TextField(blank=True, null=True)
+    row_hash = models.CharField(max_length=16, blank=True)
+
     # name
     last_name = models.TextField(blank=True)
     first_name = models.TextField(blank=True)
 
     # address
     street_number = models.TextField(blank=True)
-    street_name = models.TextField(blank=True)
+    street = models.ForeignKey(StreetName, on_delete=models.PROTECT, related_name='+')
     apartment_number = models.TextField(blank=True)
-    zip_code = models.TextField(blank=True)
+    zip = models.ForeignKey(ZipCode, on_delete=models.PROTECT, related_name='+')
+
+    # normalized address shared by everyone in the same household
+    household = models.TextField(blank=True)
 
     # dates
     date_of_birth = models.DateField(blank=True)
     date_of_registration = models.DateField(blank=True)
-    party_affiliation = models.TextField(blank=True)
+    party = models.ForeignKey(Party, on_delete=models.PROTECT, related_name='+', db_index=False)
 
     # idk
-    precinct_number = models.TextField(blank=True)
+    precinct = models.ForeignKey(Precinct, on_delete=models.PROTECT, related_name='+')
 
     # voting history
     v20state = models.BooleanField(default=False)
@@ -38,66 +126,108 @@ class Voter(models.Model):
     # voter score
     voter_score = models.IntegerField(default=0)
 
+    # chance of voting in the next election in percent, set by the score_voters command
+    propensity = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        # composite indexes matching the filter form on the voter list and graphs pages,
+        # each led by the dataset so a query only reads the selected roll
+        indexes = [
+            models.Index(fields=['dataset', 'party', 'voter_score', 'date_of_birth'], name='voter_party_score_dob_idx'),
+            models.Index(fields=['dataset', 'voter_score', 'date_of_birth'], name='voter_score_dob_idx'),
+            models.Index(fields=['dataset', 'date_of_birth'], name='voter_dob_idx'),
+            models.Index(fields=['dataset', 'v20state', 'v21town', 'v21primary', 'v22general', 'v23town'],
+                         name='voter_elections_idx'),
+            # any other election checked on its own
+            models.Index(fields=['dataset', 'v21town'], name='voter_v21town_idx'),
+            models.Index(fields=['dataset', 'v21primary'], name='voter_v21primary_idx'),
+            models.Index(fields=['dataset', 'v22general'], name='voter_v22general_idx'),
+            models.Index(fields=['dataset', 'v23town'], name='voter_v23town_idx'),
+            # sort key of the voter list, used to seek to each page
+            models.Index(fields=['dataset', 'last_name', 'first_name', 'id'], name='voter_name_idx'),
+            # occupants of each household, in the order they are listed
+            models.Index(fields=['dataset', 'household', 'last_name', 'first_name'], name='voter_household_idx'),
+            # filter and sort on the turnout propensity score
+            models.Index(fields=['dataset', 'propensity', 'id'], name='voter_propensity_idx'),
+        ]
+        constraints = [
+            # voter ids are only unique within one town's file
+            models.UniqueConstraint(fields=['dataset', 'voter_id'], name='voter_dataset_voter_id_uniq'),
+        ]
+
     def __str__(self):
         ''' return string representation of this voter's info '''
-        return f'{self.first_name}, {self.last_name}, {self.zip_code}, {self.date_of_birth}, {self.v20state}' 
-        
-def load_data():
-    '''Function to load data records from CSV file into Django model instances.'''
-
-    filename = "C:/newton_voters.csv"
-    
-    # Use 'with open' for proper file handling
-    with open(filename, 'r') as f:
-        # Use csv.reader for robust CSV parsing
-        reader = csv.reader(f)
-        next(reader) # discard headers
-        
-        created_count = 0
-        
-        for fields in reader:
-            if not fields: # Skip empty lines
-                continue
-            
-            # Helper to convert "TRUE" or "FALSE" strings to Python bools
-            def str_to_bool(s):
-                return s.strip().upper() == 'TRUE' if s.strip() else False
-
-            try:
-                # 1. Clean up and convert data types before creating the model
-                voter = Voter(
-                    last_name=fields[1].strip(),
-                    first_name=fields[2].strip(),
-
-                    street_number=fields[3].strip(),
-                    street_name=fields[4].strip(),
-                    apartment_number=fields[5].strip(),
-                    zip_code=fields[6].strip(),
-
-                    # Date Conversion: 'YYYY-MM-DD' string to datetime.date object
-                    date_of_birth=datetime.strptime(fields[7].strip(), '%Y-%m-%d').date() if fields[7].strip() else None,
-                    date_of_registration=datetime.strptime(fields[8].strip(), '%Y-%m-%d').date() if fields[8].strip() else None,
-                    party_affliation=fields[9].strip(),
-
-                    precinct_number=fields[10].strip(),
-
-                    # Boolean Conversion
-                    v20state=str_to_bool(fields[11]),
-                    v21town=str_to_bool(fields[12]),
-                    v21primary=str_to_bool(fields[13]),
-                    v22general=str_to_bool(fields[14]),
-                    v23town=str_to_bool(fields[15]),
-
-                    # Integer Conversion
-                    voter_score=int(fields[16].strip()) if fields[16].strip() else 0,
-                )
-                
-                # 2. COMMIT to database
-                voter.save() 
-                created_count += 1
-                print(f'Created voter: {voter}')
-                
-            except Exception as e:
-                print(f"Skipped record due to error: {e} with fields: {fields}")
-        
-    print(f'Done. Created {created_count} voters.')
\ No newline at end of file
+        return f'{self.first_name}, {self.last_name}, {self.zip_code}, {self.date_of_birth}, {self.v20state}'
+
+    # text values of the coded fields, decoded without a join
+    @property
+    def party_affiliation(self):
+        return Party.decode(self.party_id)
+
+    @property
+    def zip_code(self):
+        return ZipCode.decode(self.zip_id)
+
+    @property
+    def precinct_number(self):
+        return Precinct.decode(self.precinct_id)
+
+    @property
+    def street_name(self):
+        return StreetName.decode(self.street_id)
+
+
+class VoterRollup(models.Model):
+    ''' precomputed number of voters sharing the same filterable attributes '''
+
+    dataset = models.ForeignKey(Dataset, on_delete=models.PROTECT, related_name='+')
+    party_affiliation = models.TextField(blank=True)
+    birth_year = models.IntegerField()
+    voter_score = models.IntegerField(default=0)
+
+    # voting history
+    v20state = models.BooleanField(default=False)
+    v21town = models.BooleanField(default=False)
+    v21primary = models.BooleanField(default=False)
+    v22general = models.BooleanField(default=False)
+    v23town = models.BooleanField(default=False)
+
+    # number of voters with exactly these attributes
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        ''' return string representation of this rollup row '''
+        return f'{self.party_affiliation}, {self.birth_year}, {self.voter_score}: {self.count}'
+
+
+class PrecinctTurnout(models.Model):
+    ''' precomputed number of voters, and of those who voted in each election, per precinct and zip code '''
+
+    dataset = models.ForeignKey(Dataset, on_delete=models.PROTECT, related_name='+')
+    precinct_number = models.TextField(blank=True)
+    zip_code = models.TextField(blank=True)
+
+    # registered voters in this precinct and zip code
+    voters = models.IntegerField(default=0)
+
+    # how many of them voted in each election
+    v20state = models.IntegerField(default=0)
+    v21town = models.IntegerField(default=0)
+    v21primary = models.IntegerField(default=0)
+    v22general = models.IntegerField(default=0)
+    v23town = models.IntegerField(default=0)
+
+    def __str__(self):
+        ''' return string representation of this turnout row '''
+        return f'{self.precinct_number}, {self.zip_code}: {self.voters} voters'
+
+
+class DataVersion(models.Model):
+    ''' counter bumped whenever the voter data changes, used to invalidate cached results '''
+
+    name = models.CharField(max_length=50, unique=True)
+    version = models.IntegerField(default=0)
+
+    def __str__(self):
+        ''' return string representation of this data version '''
+        return f'{self.name}: {self.version}'
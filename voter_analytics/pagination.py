@@ -0,0 +1,135 @@
+# File: pagination.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: keyset (cursor) pagination that seeks on the sort key instead of using OFFSET
+
+import base64
+import json
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+
+
+def encode_cursor(values, direction):
+    ''' return an opaque token for the sort key values and direction ('n'ext or 'p'revious) '''
+    raw = json.dumps([direction] + list(values), separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    ''' return (direction, values) for a token, or None if it is not a valid cursor '''
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        direction, *values = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    if direction not in ('n', 'p'):
+        return None
+    return direction, values
+
+
+def field_name(field):
+    ''' return the name of an ordering field without its '-' (descending) prefix '''
+    return field.lstrip('-')
+
+
+def seek(fields, values, after):
+    ''' build the condition for rows sorted after (or before) values on fields, which may be descending '''
+    condition = Q()
+    for i, field in enumerate(fields):
+        op = 'gt' if after != field.startswith('-') else 'lt'
+        equal = {field_name(f): v for f, v in zip(fields[:i], values[:i])}
+        condition |= Q(**equal, **{f'{field_name(field)}__{op}': values[i]})
+    return condition
+
+
+def reverse(field):
+    ''' return an ordering field sorted the other way '''
+    return field[1:] if field.startswith('-') else f'-{field}'
+
+
+class KeysetPage:
+    ''' one page of results with tokens for the neighbouring pages '''
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    '''
+    Paginate a QuerySet by seeking past the last row seen on the ordering
+    fields, each of which may be descending ('-field') and none of which
+    may be null. The last field must be unique so every row has a distinct key.
+    Each page costs one indexed range query no matter how deep it is.
+    '''
+
+    def __init__(self, queryset, per_page, ordering=('last_name', 'first_name', 'id')):
+        self.queryset = queryset.order_by(*ordering)
+        self.per_page = per_page
+        self.ordering = list(ordering)
+
+    def key(self, obj):
+        ''' return the sort key values of obj, a model instance or a values() dict '''
+        names = [field_name(f) for f in self.ordering]
+        if isinstance(obj, dict):
+            return [obj[f] for f in names]
+        return [getattr(obj, f) for f in names]
+
+    def clean(self, values):
+        '''
+        Return cursor values converted to the types of the ordering fields,
+        or None if the token was tampered with: wrong length, a null, or a
+        value the field cannot hold.
+        '''
+        if len(values) != len(self.ordering):
+            return None
+        cleaned = []
+        for field, value in zip(self.ordering, values):
+            if value is None or isinstance(value, (list, dict)):
+                return None
+            try:
+                value = self.queryset.model._meta.get_field(field_name(field)).to_python(value)
+            except FieldDoesNotExist:  # an annotation, compared as given
+                pass
+            except (ValidationError, TypeError, ValueError):
+                return None
+            cleaned.append(value)
+        return cleaned
+
+    def page(self, token=None):
+        ''' return the KeysetPage for a cursor token (the first page if token is empty or invalid) '''
+        cursor = decode_cursor(token) if token else None
+        values = self.clean(cursor[1]) if cursor else None
+        if values is None:
+            direction = 'n'
+        else:
+            direction = cursor[0]
+
+        if direction == 'n':
+            queryset = self.queryset
+            if values is not None:
+                queryset = queryset.filter(seek(self.ordering, values, after=True))
+        else:
+            backwards = [reverse(f) for f in self.ordering]
+            queryset = self.queryset.filter(seek(self.ordering, values, after=False)).order_by(*backwards)
+
+        # fetch one extra row to learn whether there is a further page
+        rows = list(queryset[:self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if direction == 'p':
+            rows.reverse()
+            has_next, has_previous = True, more
+        else:
+            has_next, has_previous = more, values is not None
+
+        next_cursor = encode_cursor(self.key(rows[-1]), 'n') if rows and has_next else None
+        previous_cursor = encode_cursor(self.key(rows[0]), 'p') if rows and has_previous else None
+        return KeysetPage(rows, next_cursor, previous_cursor)
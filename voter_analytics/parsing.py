@@ -0,0 +1,90 @@
+# File: parsing.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: parsing of voter file rows, kept free of Django so spawned import workers can load it
+
+import hashlib
+from datetime import date
+from itertools import islice
+
+# number of columns expected in each row of the voter file
+NUM_COLUMNS = 17
+
+
+def str_to_bool(s):
+    ''' convert "TRUE" or "FALSE" strings to python bools '''
+    return s.strip().upper() == 'TRUE'
+
+
+def parse_date(s):
+    ''' convert a 'YYYY-MM-DD' string to a date, raising ValueError if missing '''
+    s = s.strip()
+    if not s:
+        raise ValueError('missing date')
+    return date.fromisoformat(s)
+
+
+def row_hash(fields):
+    ''' return a short hash of the contents of a row, used to spot changed voters '''
+    content = '\x1f'.join(f.strip() for f in fields[:NUM_COLUMNS])
+    return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+
+def parse_row(fields):
+    '''
+    Convert one row of the voter file into a dict of Voter field values.
+    Raises ValueError if the row cannot be stored.
+    '''
+    if len(fields) < NUM_COLUMNS:
+        raise ValueError(f'expected {NUM_COLUMNS} columns, got {len(fields)}')
+
+    score = fields[16].strip()
+
+    return {
+        'voter_id': fields[0].strip() or None,
+        'row_hash': row_hash(fields),
+
+        'last_name': fields[1].strip(),
+        'first_name': fields[2].strip(),
+
+        'street_number': fields[3].strip(),
+        'street_name': fields[4].strip(),
+        'apartment_number': fields[5].strip(),
+        'zip_code': fields[6].strip(),
+
+        'date_of_birth': parse_date(fields[7]),
+        'date_of_registration': parse_date(fields[8]),
+        'party_affiliation': fields[9].strip(),
+
+        'precinct_number': fields[10].strip(),
+
+        'v20state': str_to_bool(fields[11]),
+        'v21town': str_to_bool(fields[12]),
+        'v21primary': str_to_bool(fields[13]),
+        'v22general': str_to_bool(fields[14]),
+        'v23town': str_to_bool(fields[15]),
+
+        'voter_score': int(score) if score else 0,
+    }
+
+
+def parse_chunk(rows):
+    ''' parse a list of raw rows, returning (parsed values, rejected (row, error) pairs) '''
+    parsed = []
+    rejected = []
+    for fields in rows:
+        if not fields:  # skip empty lines
+            continue
+        try:
+            parsed.append(parse_row(fields))
+        except ValueError as e:
+            rejected.append((fields, str(e)))
+    return parsed, rejected
+
+
+def read_chunks(reader, size):
+    ''' yield lists of at most size raw rows from a csv reader '''
+    while True:
+        chunk = list(islice(reader, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,88 @@
+# File: pivot.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: cross-tab (pivot) counts of voters over two or three dimensions, computed from the rollup table
+
+from collections import Counter
+from django.db.models import Sum
+from .analytics import elections, parse_filters
+from .rollups import filter_rollups
+
+# dimensions a pivot can use, mapped to the VoterRollup field each is derived from
+PIVOT_DIMENSIONS = {
+    'party_affiliation': 'party_affiliation',
+    'birth_year': 'birth_year',
+    'birth_decade': 'birth_year',
+    'voter_score': 'voter_score',
+    **{e: e for e in elections},
+}
+
+
+def parse_dimensions(params):
+    '''
+    Return the list of dimensions named in ?dims= (comma separated) of params.
+    Raises ValueError unless there are two or three distinct known dimensions.
+    '''
+    dims = [d.strip() for d in params.get('dims', '').split(',') if d.strip()]
+    unknown = [d for d in dims if d not in PIVOT_DIMENSIONS]
+    if unknown:
+        raise ValueError(f'unknown dimensions: {", ".join(unknown)}')
+    if not 2 <= len(dims) <= 3 or len(set(dims)) != len(dims):
+        raise ValueError('choose two or three different dimensions')
+    if 'birth_year' in dims and 'birth_decade' in dims:
+        raise ValueError('birth_year and birth_decade cannot be combined')
+    return dims
+
+
+def dimension_value(name, value):
+    ''' convert a rollup field value to the value of a pivot dimension '''
+    return value // 10 * 10 if name == 'birth_decade' else value
+
+
+def sort_values(values):
+    ''' sort the distinct values of a dimension, with blanks last '''
+    return sorted(values, key=lambda v: (v in (None, ''), v))
+
+
+def pivot_table(params, dims):
+    '''
+    Count the voters matching the filter form in params for every
+    combination of dims, with one GROUP BY over the rollup table. Returns a
+    dict of the dimensions, the sorted values of each, the non-empty cells
+    and the total.
+    '''
+    fields = list(dict.fromkeys(PIVOT_DIMENSIONS[d] for d in dims))
+    rows = (filter_rollups(params).order_by()
+                                  .values(*fields)
+                                  .annotate(n=Sum('count')))
+
+    counts = Counter()
+    for row in rows:
+        counts[tuple(dimension_value(d, row[PIVOT_DIMENSIONS[d]]) for d in dims)] += row['n']
+
+    return {
+        'dimensions': dims,
+        'filters': parse_filters(params),
+        'values': {d: sort_values({key[i] for key in counts}) for i, d in enumerate(dims)},
+        'cells': [{**dict(zip(dims, key)), 'count': n} for key, n in sorted(counts.items(), key=lambda c: str(c[0]))],
+        'total': sum(counts.values()),
+    }
+
+
+def pivot_rows(table):
+    '''
+    Yield the table as rows of a wide cross-tab: the values of every
+    dimension but the last, then one count per value of the last dimension
+    and a row total. The first row is the header.
+    '''
+    *row_dims, col_dim = table['dimensions']
+    columns = table['values'][col_dim]
+    yield [*row_dims, *(f'{col_dim}={v}' for v in columns), 'total']
+
+    grid = {}
+    for cell in table['cells']:
+        key = tuple(cell[d] for d in row_dims)
+        grid.setdefault(key, {})[cell[col_dim]] = cell['count']
+
+    for key in sorted(grid, key=lambda k: [(v in (None, ''), v) for v in k]):
+        counts = [grid[key].get(v, 0) for v in columns]
+        yield [*key, *counts, sum(counts)]
@@ -0,0 +1,155 @@
+# File: propensity.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: vectorized turnout-propensity scoring of every voter with NumPy
+
+import time
+from datetime import date
+from django.db import connection, transaction
+from .analytics import elections, to_int
+from .models import Voter
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; without it voters are simply left unscored
+    np = None
+
+# day each election was held, used for eligibility and recency
+ELECTION_DATES = {
+    'v20state': date(2020, 11, 3),
+    'v21town': date(2021, 11, 2),
+    'v21primary': date(2021, 9, 14),
+    'v22general': date(2022, 11, 8),
+    'v23town': date(2023, 11, 7),
+}
+
+# weight of each election on the score: recent behaviour predicts the next election best
+ELECTION_WEIGHTS = {
+    'v20state': 0.5,
+    'v21town': 0.8,
+    'v21primary': 0.7,
+    'v22general': 1.1,
+    'v23town': 1.5,
+}
+
+# ordinal of the datetime64 epoch, to turn dates into day numbers
+EPOCH = date(1970, 1, 1).toordinal()
+
+# date the score predicts turnout for, from which age and tenure are measured
+SCORED_AT = date(2024, 11, 5)
+
+# intercept and weights of age and years on the roll in the logistic model
+INTERCEPT = -0.6
+AGE_WEIGHT = 1.2     # over ages 18 to 68, where turnout stops rising
+TENURE_WEIGHT = 0.6  # over the first 10 years after registering
+
+
+def filter_propensity(voters, params):
+    ''' apply the min_propensity and max_propensity (percent) fields of params to a Voter QuerySet '''
+    low, high = to_int(params.get('min_propensity')), to_int(params.get('max_propensity'))
+    if low is not None:
+        voters = voters.filter(propensity__gte=low)
+    if high is not None:
+        voters = voters.filter(propensity__lte=high)
+    return voters
+
+
+def score_arrays(birth_days, registration_days, voted):
+    '''
+    Score voters from NumPy arrays of date of birth and date of registration
+    (as datetime64[D]) and a (voters x elections) boolean array of turnout.
+    Each election an eligible voter took part in adds its weight and each
+    one they skipped subtracts it; elections held before they registered
+    are ignored. Returns the chance of voting in percent.
+    '''
+    held = np.array([ELECTION_DATES[e] for e in elections], dtype='datetime64[D]')
+    weights = np.array([ELECTION_WEIGHTS[e] for e in elections], dtype=np.float32)
+    scored_at = np.datetime64(SCORED_AT, 'D')
+
+    eligible = registration_days[:, None] <= held[None, :]
+    history = np.where(voted, 1.0, -1.0).astype(np.float32) * eligible @ weights
+
+    age = (scored_at - birth_days).astype(np.float32) / 365.25
+    tenure = (scored_at - registration_days).astype(np.float32) / 365.25
+    logit = (INTERCEPT + history
+             + AGE_WEIGHT * np.clip((age - 18) / 50, 0, 1)
+             + TENURE_WEIGHT * np.clip(tenure / 10, 0, 1))
+
+    return np.round(100 / (1 + np.exp(-logit.astype(np.float64))), 1)
+
+
+def to_days(dates):
+    ''' convert a sequence of dates to a datetime64[D] array, much faster than letting NumPy parse them '''
+    days = np.fromiter((d.toordinal() for d in dates), dtype=np.int64, count=len(dates))
+    return (days - EPOCH).astype('datetime64[D]')
+
+
+def read_voters(queryset):
+    '''
+    Return (ids, birth dates, registration dates, turnout) arrays for the
+    voters in a QuerySet, or None if there are none. Rows are read with a
+    plain cursor, skipping model and values_list overhead.
+    '''
+    queryset = queryset.values_list('pk', 'date_of_birth', 'date_of_registration', *elections)
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    if not rows:
+        return None
+
+    columns = list(zip(*rows))
+    return (
+        np.array(columns[0], dtype=np.int64),
+        to_days(columns[1]),
+        to_days(columns[2]),
+        np.array(columns[3:], dtype=bool).T,
+    )
+
+
+def read_chunk(after, chunk_size):
+    ''' return the arrays of read_voters for the next chunk_size voters with an id above after '''
+    return read_voters(Voter.objects.filter(pk__gt=after).order_by('pk')[:chunk_size])
+
+
+def write_scores(ids, scores):
+    ''' store the scores of one chunk with a single batched UPDATE statement '''
+    table = Voter._meta.db_table
+    column = Voter._meta.get_field('propensity').column
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(f'UPDATE {table} SET {column} = %s WHERE id = %s',
+                           list(zip(scores.tolist(), ids.tolist())))
+
+
+def score_voters(chunk_size=100000):
+    '''
+    Compute and store the turnout propensity of every voter, chunk_size
+    voters at a time: each chunk is read into arrays, scored in one
+    vectorized pass and written back in one transaction. Returns
+    (number of voters scored, seconds taken).
+    '''
+    started = time.perf_counter()
+    scored = 0
+    after = 0
+    while True:
+        chunk = read_chunk(after, chunk_size)
+        if chunk is None:
+            break
+        ids, birth_days, registration_days, voted = chunk
+        write_scores(ids, score_arrays(birth_days, registration_days, voted))
+        scored += len(ids)
+        after = int(ids[-1])
+    return scored, time.perf_counter() - started
+
+
+def score_ids(pks, chunk_size=500):
+    ''' compute and store the propensity of the voters with these pks, e.g. those a delta import wrote '''
+    pks = list(pks)
+    scored = 0
+    for i in range(0, len(pks), chunk_size):
+        chunk = read_voters(Voter.objects.filter(pk__in=pks[i:i + chunk_size]))
+        if chunk is None:
+            continue
+        ids, birth_days, registration_days, voted = chunk
+        write_scores(ids, score_arrays(birth_days, registration_days, voted))
+        scored += len(ids)
+    return scored
@@ -0,0 +1,61 @@
+# File: rollups.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: maintenance and querying of the precomputed VoterRollup table
+
+from collections import Counter
+from django.db import transaction
+from django.db.models import F, Sum
+from .analytics import apply_filters, elections, filter_dataset, grouped_counts, parse_filters, summarize_voters
+from .models import Voter, VoterRollup
+
+# attributes that make up one rollup row
+ROLLUP_KEY = ['dataset_id', 'party_affiliation', 'birth_year', 'voter_score'] + elections
+
+
+def rebuild_rollups(dataset):
+    ''' recompute the VoterRollup rows of a dataset from its voters, returning the number of rows '''
+    rows = grouped_counts(filter_dataset(Voter.objects.all(), dataset), ROLLUP_KEY)
+
+    with transaction.atomic():
+        filter_dataset(VoterRollup.objects.all(), dataset).delete()
+        rollups = [VoterRollup(count=row['n'], **{k: row[k] for k in ROLLUP_KEY}) for row in rows]
+        VoterRollup.objects.bulk_create(rollups, batch_size=1000)
+
+    return len(rollups)
+
+
+def rollup_counts(voters):
+    ''' return a Counter of rollup key tuples to the number of voters in a QuerySet with that key '''
+    return Counter({tuple(row[k] for k in ROLLUP_KEY): row['n'] for row in grouped_counts(voters, ROLLUP_KEY)})
+
+
+def apply_rollup_changes(changes):
+    '''
+    Add a Counter of rollup key tuples to voter count changes onto the
+    rollup table, touching only those rows. Rows left empty are removed.
+    '''
+    with transaction.atomic():
+        for key, n in changes.items():
+            if not n:
+                continue
+            attributes = dict(zip(ROLLUP_KEY, key))
+            if not VoterRollup.objects.filter(**attributes).update(count=F('count') + n):
+                VoterRollup.objects.create(count=n, **attributes)
+        VoterRollup.objects.filter(count__lte=0).delete()
+
+
+def filter_rollups(params, rollups=None):
+    ''' return the rollup rows matching the filter form in params '''
+    if rollups is None:
+        rollups = VoterRollup.objects.all()
+    return apply_filters(rollups, parse_filters(params), 'birth_year')
+
+
+def summarize_rollups(params):
+    ''' compute the chart totals for the voters matching params from the rollup table '''
+    return summarize_voters(filter_rollups(params), weight='count')
+
+
+def count_voters(params):
+    ''' return the number of voters matching params from the rollup table '''
+    return filter_rollups(params).aggregate(n=Sum('count', default=0))['n']
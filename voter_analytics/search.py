@@ -0,0 +1,119 @@
+# File: search.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: SQLite FTS5 name and address search over voters
+
+import re
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from cs412.fts import page_of, search_enabled
+from .models import Dataset, Voter
+
+# FTS5 table holding the searchable text of each voter, keyed by Voter id
+SEARCH_TABLE = 'voter_analytics_voter_search'
+
+# search results shown on each page
+SEARCH_LIMIT = 100
+
+
+# searchable text of each voter, with the street and zip lookup codes decoded
+INDEX_SELECT = '''
+    SELECT v.id, v.last_name, v.first_name, s.value, z.value
+    FROM voter_analytics_voter v
+    JOIN voter_analytics_streetname s ON s.id = v.street_id
+    JOIN voter_analytics_zipcode z ON z.id = v.zip_id
+'''
+# text columns of the search table
+SEARCH_COLUMNS = ['last_name', 'first_name', 'street_name', 'zip_code']
+
+INDEX_INSERT = f'INSERT INTO {SEARCH_TABLE} (rowid, {", ".join(SEARCH_COLUMNS)})'
+
+
+def unindex_dataset(dataset):
+    ''' remove the voters of a dataset from the search table '''
+    code = Dataset.encode(dataset)
+    if not search_enabled() or code is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN '
+                       f'(SELECT id FROM voter_analytics_voter WHERE dataset_id = %s)', [code])
+
+
+def rebuild_search_index(dataset):
+    ''' refill the search entries of a dataset's voters from the Voter table '''
+    code = Dataset.encode(dataset)
+    if not search_enabled() or code is None:
+        return
+    unindex_dataset(dataset)
+    with connection.cursor() as cursor:
+        cursor.execute(f'{INDEX_INSERT} {INDEX_SELECT} WHERE v.dataset_id = %s', [code])
+
+
+def index_voters(pks):
+    ''' add the voters with these pks to the search table '''
+    if not search_enabled():
+        return
+    with connection.cursor() as cursor:
+        for i in range(0, len(pks), 500):
+            chunk = pks[i:i + 500]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f'{INDEX_INSERT} {INDEX_SELECT} WHERE v.id IN ({placeholders})', chunk)
+
+
+def unindex_voters(pks):
+    ''' remove the voters with these pks from the search table '''
+    if not search_enabled():
+        return
+    with connection.cursor() as cursor:
+        for i in range(0, len(pks), 500):
+            chunk = pks[i:i + 500]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})', chunk)
+
+
+def match_expression(query):
+    '''
+    Turn free text into an FTS5 query where every word must appear as the
+    start of some name, street or zip word, e.g. "smi elm" matches Smith on
+    Elmwood St. Returns None if the text has no words.
+    '''
+    words = re.findall(r'\w+', query)
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def ranked_ids(voters, query, limit=None, offset=0):
+    '''
+    Return the ids of the voters from a Voter QuerySet that match query,
+    best matches first, skipping offset and returning at most limit (all
+    when None). The ranked ids come straight from the FTS index, so the
+    cost depends on the number of matches rather than on the size of the roll.
+    '''
+    match = match_expression(query)
+    if match is None or not search_enabled():
+        return []
+
+    # run the full-text match once, then rank what is left after the filters
+    sql = (f'WITH matches AS MATERIALIZED '
+           f'(SELECT rowid AS id, rank FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s) '
+           f'SELECT id FROM matches')
+    params = [match]
+
+    # only restrict to the filtered voters when there are filters to apply
+    if voters.query.where:
+        try:
+            voters_sql, voters_params = voters.order_by().values('pk').query.sql_with_params()
+        except EmptyResultSet:  # the filters rule out every voter, e.g. an unknown party
+            return []
+        sql += f' WHERE id IN ({voters_sql})'
+        params += list(voters_params)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'{sql} ORDER BY rank LIMIT %s OFFSET %s', params + [-1 if limit is None else limit, offset])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_voters(voters, query, page=1, per_page=SEARCH_LIMIT):
+    ''' return the SearchPage of voters from a Voter QuerySet that best match query '''
+    ids = ranked_ids(voters, query, per_page + 1, (page - 1) * per_page)
+    return page_of(Voter.objects.all(), ids, page, per_page)
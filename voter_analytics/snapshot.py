@@ -0,0 +1,176 @@
+# File: snapshot.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: binary snapshots of the voter dataset as small SQLite files, for fast dev and staging restores
+
+import os
+from datetime import datetime
+from django.db import connection, transaction
+from django.db.migrations.recorder import MigrationRecorder
+from .cache import bump_data_version, voter_data
+from .models import Dataset, Party, PrecinctTurnout, Precinct, StreetName, Voter, VoterRollup, ZipCode
+from .search import SEARCH_COLUMNS, SEARCH_TABLE, search_enabled
+
+# lookup tables of the coded fields and datasets
+LOOKUP_MODELS = [Dataset, Party, ZipCode, Precinct, StreetName]
+
+# tables computed from Voter
+DERIVED_MODELS = [VoterRollup, PrecinctTurnout]
+
+# alias the snapshot file is attached under
+SNAPSHOT = 'snapshot'
+
+# snapshot table holding the search text of each voter
+SNAPSHOT_SEARCH = 'voter_search'
+
+
+class SnapshotError(Exception):
+    ''' raised when a snapshot cannot be written or restored into this database '''
+
+
+def schema_version():
+    ''' return the newest applied voter_analytics migration, which snapshots must match '''
+    applied = MigrationRecorder(connection).applied_migrations()
+    return max(name for app, name in applied if app == 'voter_analytics')
+
+
+def table(model):
+    ''' return the quoted table name of a model '''
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def columns(model):
+    ''' return the quoted column names of a model's concrete fields '''
+    return [connection.ops.quote_name(f.column) for f in model._meta.concrete_fields]
+
+
+class attached:
+    ''' context manager attaching a SQLite file to the default connection as SNAPSHOT '''
+
+    def __init__(self, path):
+        self.path = path
+
+    def __enter__(self):
+        if connection.vendor != 'sqlite':
+            raise SnapshotError('voter snapshots need the SQLite database backend')
+        self.cursor = connection.cursor()
+        self.cursor.execute(f'ATTACH DATABASE %s AS {SNAPSHOT}', [self.path])
+        return self.cursor
+
+    def __exit__(self, *exc):
+        self.cursor.execute(f'DETACH DATABASE {SNAPSHOT}')
+        self.cursor.close()
+
+
+def dump_voters(path):
+    '''
+    Write the voters, their lookup tables, rollups, turnout and search text
+    to a new SQLite file at path. Returns a dict of table name to rows.
+    '''
+    partial = f'{path}.partial'
+    if os.path.exists(partial):
+        os.remove(partial)
+
+    counts = {}
+    with attached(partial) as cursor, transaction.atomic():
+        # lookup tables keep their primary key, so restore can translate codes with index lookups
+        for model in LOOKUP_MODELS:
+            cursor.execute(f'CREATE TABLE {SNAPSHOT}.{table(model)} (id INTEGER PRIMARY KEY, value TEXT)')
+            cursor.execute(f'INSERT INTO {SNAPSHOT}.{table(model)} SELECT id, value FROM main.{table(model)}')
+
+        for model in [Voter] + DERIVED_MODELS:
+            cursor.execute(f'CREATE TABLE {SNAPSHOT}.{table(model)} AS '
+                           f'SELECT {", ".join(columns(model))} FROM main.{table(model)}')
+
+        for model in LOOKUP_MODELS + [Voter] + DERIVED_MODELS:
+            counts[model._meta.db_table] = model.objects.count()
+
+        if search_enabled():
+            cursor.execute(f'CREATE TABLE {SNAPSHOT}.{SNAPSHOT_SEARCH} AS '
+                           f'SELECT rowid AS id, {", ".join(SEARCH_COLUMNS)} FROM main.{SEARCH_TABLE}')
+
+        cursor.execute(f'CREATE TABLE {SNAPSHOT}.snapshot_info (key TEXT PRIMARY KEY, value TEXT)')
+        cursor.executemany(f'INSERT INTO {SNAPSHOT}.snapshot_info VALUES (%s, %s)', [
+            ('schema', schema_version()),
+            ('created', datetime.now().isoformat(timespec='seconds')),
+        ])
+
+    os.replace(partial, path)
+    return counts
+
+
+def snapshot_select(model):
+    '''
+    Return the SELECT copying a model's snapshot rows into the database.
+    Codes into lookup tables are translated through their values, because
+    codes in the snapshot may differ from the codes already handed out
+    here, and codes are never reused.
+    '''
+    select, joins = [], []
+    for field in model._meta.concrete_fields:
+        if field.related_model not in LOOKUP_MODELS:
+            select.append(f't.{connection.ops.quote_name(field.column)}')
+            continue
+        lookup = table(field.related_model)
+        old, new = f'{field.name}_old', f'{field.name}_new'
+        joins.append(f'JOIN {SNAPSHOT}.{lookup} {old} ON {old}.id = t.{field.column} '
+                     f'JOIN main.{lookup} {new} ON {new}.value = {old}.value')
+        select.append(f'{new}.id')
+    return f'SELECT {", ".join(select)} FROM {SNAPSHOT}.{table(model)} t {" ".join(joins)}'
+
+
+def restore_voters(path):
+    '''
+    Replace the voters, rollups, turnout and search index with the snapshot
+    at path in one transaction. Voter indexes are dropped during the bulk
+    INSERT ... SELECT and built once afterwards. Returns a dict of table
+    name to rows restored.
+    '''
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+
+    counts = {}
+    with attached(path) as cursor:
+        cursor.execute(f"SELECT value FROM {SNAPSHOT}.snapshot_info WHERE key = 'schema'")
+        snapshot_schema = cursor.fetchone()[0]
+        if snapshot_schema != schema_version():
+            raise SnapshotError(f'snapshot was taken at migration {snapshot_schema}, '
+                                f'but this database is at {schema_version()}')
+
+        with transaction.atomic():
+            # values new to this database get new codes; existing codes keep their meaning
+            for model in LOOKUP_MODELS:
+                cursor.execute(f'INSERT OR IGNORE INTO main.{table(model)} (value) '
+                               f'SELECT value FROM {SNAPSHOT}.{table(model)}')
+
+            cursor.execute("SELECT name, sql FROM main.sqlite_master "
+                           "WHERE type = 'index' AND tbl_name = %s AND sql IS NOT NULL", [Voter._meta.db_table])
+            indexes = cursor.fetchall()
+            for name, _ in indexes:
+                cursor.execute(f'DROP INDEX main.{connection.ops.quote_name(name)}')
+
+            for model in [Voter] + DERIVED_MODELS:
+                cursor.execute(f'DELETE FROM main.{table(model)}')
+            for model in [Voter] + DERIVED_MODELS:
+                cursor.execute(f'INSERT INTO main.{table(model)} ({", ".join(columns(model))}) {snapshot_select(model)}')
+
+            for _, sql in indexes:
+                cursor.execute(sql)
+
+            if search_enabled():
+                # recreating the FTS table is much faster than deleting its rows one by one
+                cursor.execute("SELECT sql FROM main.sqlite_master WHERE name = %s", [SEARCH_TABLE])
+                create_search = cursor.fetchone()[0]
+                cursor.execute(f'DROP TABLE main.{SEARCH_TABLE}')
+                cursor.execute(create_search)
+                cursor.execute(f'INSERT INTO main.{SEARCH_TABLE} (rowid, {", ".join(SEARCH_COLUMNS)}) '
+                               f'SELECT id, {", ".join(SEARCH_COLUMNS)} FROM {SNAPSHOT}.{SNAPSHOT_SEARCH}')
+
+            for model in [Voter] + DERIVED_MODELS:
+                counts[model._meta.db_table] = model.objects.count()
+
+            # every dataset changed: those replaced from the snapshot and those emptied by it
+            cursor.execute(f'SELECT value FROM main.{table(Dataset)}')
+            for (dataset,) in cursor.fetchall():
+                bump_data_version(voter_data(dataset))
+
+    return counts
@@ -0,0 +1,96 @@
+# File: synthetic.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: generator of realistic synthetic voter rows for load testing voter_analytics
+
+import random
+from datetime import date, timedelta
+from .analytics import elections
+
+# share of registered voters in each party, roughly matching the Newton roll
+PARTY_WEIGHTS = {
+    'U': 55.0, 'D': 33.0, 'R': 8.0, 'J': 1.0, 'A': 0.6, 'CC': 0.4, 'X': 0.3,
+    'L': 0.3, 'Q': 0.2, 'S': 0.2, 'FF': 0.15, 'G': 0.15, 'HH': 0.1, 'T': 0.1,
+    'AA': 0.1, 'GG': 0.05, 'Z': 0.05, 'O': 0.05, 'P': 0.05, 'E': 0.05,
+    'V': 0.03, 'H': 0.03, 'Y': 0.03, 'W': 0.03, 'EE': 0.02, 'K': 0.02,
+}
+
+# base chance of voting in each election; town elections draw fewer voters
+TURNOUT = {'v20state': 0.80, 'v21town': 0.30, 'v21primary': 0.20, 'v22general': 0.65, 'v23town': 0.35}
+
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
+    'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson',
+    'Thomas', 'Taylor', 'Moore', 'Jackson', 'Martin', 'Lee', 'Perez', 'Thompson',
+    'White', 'Harris', 'Sanchez', 'Clark', 'Ramirez', 'Lewis', 'Robinson', 'Walker',
+    'Young', 'Allen', 'King', 'Wright', 'Scott', 'Torres', 'Nguyen', 'Hill', 'Flores',
+    'Green', 'Adams', 'Nelson', 'Baker', 'Hall', 'Rivera', 'Campbell', 'Mitchell',
+    'Carter', 'Roberts', 'Chen', 'Wang', 'Kim', 'Patel', 'Cohen', 'Murphy', 'Sullivan',
+]
+FIRST_NAMES = [
+    'James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda',
+    'David', 'Elizabeth', 'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica',
+    'Thomas', 'Sarah', 'Charles', 'Karen', 'Daniel', 'Lisa', 'Matthew', 'Nancy',
+    'Anthony', 'Betty', 'Mark', 'Margaret', 'Steven', 'Sandra', 'Paul', 'Ashley',
+    'Andrew', 'Emily', 'Joshua', 'Donna', 'Kevin', 'Michelle', 'Brian', 'Carol',
+    'Wei', 'Priya', 'Olivia', 'Noah', 'Emma', 'Liam', 'Ava', 'Ethan', 'Sofia', 'Lucas',
+]
+STREET_SUFFIXES = ['ST', 'AVE', 'RD', 'TER', 'PL', 'CIR', 'LN', 'WAY']
+ZIP_CODES = ['02458', '02459', '02460', '02461', '02462', '02464', '02465', '02466', '02467', '02468']
+PRECINCTS = [f'{ward}{precinct}' for ward in range(1, 9) for precinct in 'ABCD']
+
+# only voters at least this old on the newest election can be on the roll
+NEWEST_BIRTH_YEAR = 2004
+
+
+def street_names(rng, count=600):
+    ''' return a fixed list of made-up street names '''
+    return [f'{rng.choice(LAST_NAMES).upper()} {rng.choice(STREET_SUFFIXES)}' for _ in range(count)]
+
+
+def birth_date(rng):
+    ''' draw a date of birth with a bulge of voters in middle age '''
+    age = min(max(rng.gauss(48, 18), 19), 100)
+    year = min(NEWEST_BIRTH_YEAR, 2023 - int(age))
+    return date(year, 1, 1) + timedelta(days=rng.randrange(365))
+
+
+def generate_voters(count, seed=0):
+    '''
+    Yield count synthetic voters as dicts of Voter field values, in the same
+    shape parse_row produces. Turnout rises with age and with a per-voter
+    propensity, so election flags are correlated the way real rolls are.
+    '''
+    rng = random.Random(seed)
+    streets = street_names(rng)
+    parties = list(PARTY_WEIGHTS)
+    weights = list(PARTY_WEIGHTS.values())
+
+    for _ in range(count):
+        dob = birth_date(rng)
+        registered = dob + timedelta(days=365 * 18 + rng.randrange(365 * 30))
+        registered = min(registered, date(2023, 10, 1))
+
+        # older voters and habitual voters turn out more often
+        propensity = rng.betavariate(2, 2)
+        age_factor = min(1.0, 0.5 + (2023 - dob.year) / 100)
+        voted = {e: rng.random() < min(0.98, TURNOUT[e] * age_factor * (0.5 + propensity)) for e in elections}
+
+        yield {
+            'last_name': rng.choice(LAST_NAMES),
+            'first_name': rng.choice(FIRST_NAMES),
+
+            'street_number': str(rng.randint(1, 400)),
+            'street_name': rng.choice(streets),
+            'apartment_number': str(rng.randint(1, 12)) if rng.random() < 0.25 else '',
+            'zip_code': rng.choice(ZIP_CODES),
+
+            'date_of_birth': dob,
+            'date_of_registration': registered,
+            'party_affiliation': rng.choices(parties, weights)[0],
+
+            'precinct_number': rng.choice(PRECINCTS),
+
+            **voted,
+
+            'voter_score': sum(voted.values()),
+        }
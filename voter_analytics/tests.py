@@ -2,6 +2,406 @@
 # Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/29/2025
 # Description: file to run test cases for voter_analytics
 
-from django.test import TestCase
+import csv
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+from collections import Counter
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.http import QueryDict
+from django.test import TestCase, TransactionTestCase
+from .analytics import filter_dataset, parse_filters
+from .cache import data_version, voter_data
+from .facets import facet_counts
+from .importer import import_voter_changes, import_voters
+from .models import Dataset, Party, Precinct, PrecinctTurnout, StreetName, Voter, VoterRollup, ZipCode
+from .pagination import KeysetPaginator, encode_cursor
+from .propensity import score_voters
+from .rollups import ROLLUP_KEY, rollup_counts
+from .search import search_voters
+from .snapshot import SnapshotError, dump_voters, restore_voters
 
-# Create your tests here.
+
+class VoterTestCase(TestCase):
+    ''' test case with a small synthetic roll loaded into the default dataset '''
+
+    count = 300
+
+    @classmethod
+    def setUpTestData(cls):
+        reset_process_caches()
+        call_command('generate_voters', cls.count, '--seed', '1', stdout=StringIO())
+
+
+def reset_process_caches():
+    ''' forget the payloads cached by earlier test cases, whose data versions were rolled back '''
+    cache.clear()
+
+
+class VoterFileMixin:
+    ''' a synthetic voter file on disk, for import tests '''
+
+    count = 200
+
+    def setUp(self):
+        reset_process_caches()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'voters.csv')
+        call_command('generate_voters', self.count, '--csv', self.path, stdout=StringIO())
+
+    def read_rows(self):
+        ''' return the header and rows of the voter file '''
+        with open(self.path, newline='') as f:
+            header, *rows = csv.reader(f)
+        return header, rows
+
+    def write_rows(self, header, rows):
+        ''' replace the voter file with these rows '''
+        with open(self.path, 'w', newline='') as f:
+            csv.writer(f).writerows([header] + rows)
+
+
+class VoterFileTestCase(VoterFileMixin, TestCase):
+    ''' test case with a synthetic voter file on disk '''
+
+
+class ImportTests(VoterFileTestCase):
+    ''' full imports store each voter id once per dataset '''
+
+    def test_reimport_rejects_existing_voters(self):
+        self.assertEqual(import_voters(self.path, 'town').created, self.count)
+        stats = import_voters(self.path, 'town')
+        self.assertEqual((stats.created, stats.rejected), (0, self.count))
+        self.assertEqual(import_voters(self.path, 'other town').created, self.count)
+        self.assertEqual(filter_dataset(Voter.objects.all(), 'town').count(), self.count)
+
+    def test_duplicates_within_file_are_rejected(self):
+        header, rows = self.read_rows()
+        self.write_rows(header, rows + rows[:3])
+        stats = import_voters(self.path, 'town', batch_size=50)
+        self.assertEqual((stats.created, stats.rejected), (self.count, 3))
+        self.assertEqual(stats.errors[0][1], 'duplicate voter id')
+
+    def test_parallel_import_with_spawned_workers(self):
+        # spawn, the default on Windows and macOS, starts workers without Django set up
+        with mock.patch('voter_analytics.importer.Pool', multiprocessing.get_context('spawn').Pool):
+            stats = import_voters(self.path, 'town', batch_size=50, workers=2)
+        self.assertEqual(stats.created, self.count)
+
+    def test_delta_import_keeps_rollups_current(self):
+        import_voters(self.path, 'town')
+        header, rows = self.read_rows()
+        party, score = header.index('party_affiliation'), header.index('voter_score')
+        for row in rows[:20]:
+            row[party], row[score] = 'R', '4'
+        added = [[f'X{i:08}'] + row[1:] for i, row in enumerate(rows[:5])]
+        self.write_rows(header, rows[20:] + rows[:20:2] + added)
+
+        stats = import_voter_changes(self.path, 'town')
+        self.assertEqual((stats.created, stats.updated, stats.deleted), (5, 10, 10))
+
+        voters = filter_dataset(Voter.objects.all(), 'town')
+        stored = filter_dataset(VoterRollup.objects.all(), 'town').values(*ROLLUP_KEY, 'count')
+        self.assertEqual(rollup_counts(voters), Counter({tuple(r[k] for k in ROLLUP_KEY): r['count'] for r in stored}))
+
+    def test_delta_import_rescores_written_voters(self):
+        import_voters(self.path, 'town')
+        score_voters()
+        voters = filter_dataset(Voter.objects.all(), 'town')
+        voters.update(propensity=-1.0)
+
+        header, rows = self.read_rows()
+        voted = header.index('v22general')
+        for row in rows[:10]:
+            row[voted] = 'FALSE' if row[voted] == 'TRUE' else 'TRUE'
+        self.write_rows(header, rows + [[f'X{i:08}'] + row[1:] for i, row in enumerate(rows[:5])])
+        import_voter_changes(self.path, 'town')
+
+        # the changed and new voters are scored afresh; the rest keep what they had
+        self.assertEqual(voters.exclude(propensity=-1.0).count(), 15)
+        self.assertFalse(voters.filter(propensity__isnull=True).exists())
+
+        rescored = dict(voters.exclude(propensity=-1.0).values_list('pk', 'propensity'))
+        score_voters()
+        self.assertEqual(rescored, dict(voters.filter(pk__in=rescored).values_list('pk', 'propensity')))
+
+
+class LookupTests(TestCase):
+    ''' lookup codes cached by the process stay valid when the transaction creating them rolls back '''
+
+    def test_codes_from_rolled_back_transaction(self):
+        try:
+            with transaction.atomic():
+                Party.encode_many(['GREEN'])
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        Party.objects.create(value='LIBERTARIAN')
+
+        codes = Party.encode_many(['GREEN', 'LIBERTARIAN'])
+        self.assertEqual({v: Party.objects.get(pk=code).value for v, code in codes.items()},
+                         {'GREEN': 'GREEN', 'LIBERTARIAN': 'LIBERTARIAN'})
+
+
+class DatasetTests(VoterFileTestCase):
+    ''' datasets are loaded side by side without touching each other's derived data '''
+
+    def state(self, name):
+        ''' return what the pages show for a dataset: its stored rollups, charts, pivot and search results '''
+        rollups = sorted(filter_dataset(VoterRollup.objects.all(), name).values_list(*ROLLUP_KEY[1:], 'count'))
+        charts = self.client.get('/voter_analytics/graphs/data', {'dataset': name}).json()
+        pivot = self.client.get('/voter_analytics/pivot/json', {'dataset': name, 'dims': 'party_affiliation,v20state'})
+        voters = filter_dataset(Voter.objects.all(), name)
+        found = search_voters(voters, voters.first().last_name, per_page=1000).object_list
+        return rollups, charts, pivot.json(), found
+
+    def test_import_leaves_other_datasets_alone(self):
+        import_voters(self.path, 'town')
+        before = self.state('town')
+
+        header, rows = self.read_rows()
+        party = header.index('party_affiliation')
+        for row in rows:
+            row[party] = 'R'
+        self.write_rows(header, rows)
+        import_voters(self.path, 'village')
+
+        self.assertEqual(self.state('town'), before)
+        cache.clear()
+        self.assertEqual(self.state('town'), before)
+        self.assertEqual(self.state('village')[2]['total'], self.count)
+        self.assertEqual(self.state('village')[2]['values']['party_affiliation'], ['R'])
+
+
+class FilterTests(TestCase):
+    ''' the filter form is normalized into filters that every query path can apply '''
+
+    def test_out_of_range_years_are_clamped(self):
+        filters = parse_filters(QueryDict('min_dob_year=0&max_dob_year=99999'))
+        self.assertEqual((filters['min_dob_year'], filters['max_dob_year']), (1, 9998))
+
+        for query in ('min_dob_year=99999&max_dob_year=99999', 'min_dob_year=-5&max_dob_year=0'):
+            response = self.client.get('/voter_analytics/', QueryDict(query))
+            self.assertEqual(response.status_code, 200)
+
+
+class EndpointTests(VoterTestCase):
+    ''' the pivot, turnout and facet counts, read from the derived tables, match counting the voters '''
+
+    def test_pivot(self):
+        table = self.client.get('/voter_analytics/pivot/json', {'dims': 'party_affiliation,v20state,birth_decade',
+                                                                  'voter_score': '2'}).json()
+        self.assertEqual(table['total'], Voter.objects.filter(voter_score=2).count())
+        for cell in table['cells']:
+            voters = Voter.objects.filter(voter_score=2, party__value=cell['party_affiliation'],
+                                          v20state=cell['v20state'],
+                                          date_of_birth__year__gte=cell['birth_decade'],
+                                          date_of_birth__year__lt=cell['birth_decade'] + 10)
+            self.assertEqual(cell['count'], voters.count())
+
+        response = self.client.get('/voter_analytics/pivot/csv', {'dims': 'party_affiliation,v20state'})
+        self.assertEqual(response.content.decode().splitlines()[0], 'party_affiliation,v20state=False,v20state=True,total')
+        self.assertEqual(self.client.get('/voter_analytics/pivot/json', {'dims': 'v20state'}).status_code, 400)
+
+    def test_turnout(self):
+        rows = self.client.get('/voter_analytics/graphs/turnout', {'by': 'precinct'}).json()['rows']
+        self.assertEqual(sum(row['voters'] for row in rows), self.count)
+        for row in rows:
+            voters = Voter.objects.filter(precinct__value=row['precinct_number'])
+            self.assertEqual(row['voters'], voters.count())
+            self.assertEqual(row['voted']['v22general'], voters.filter(v22general=True).count())
+        self.assertEqual(self.client.get('/voter_analytics/graphs/turnout', {'by': 'street'}).status_code, 404)
+
+    def test_facets(self):
+        counts = facet_counts(QueryDict('party=D&v21town=on'))
+        voters = Voter.objects.filter(v21town=True)
+        self.assertEqual(counts['total'], voters.filter(party__value='D').count())
+        # the party dropdown counts every party under the other filters
+        for party, n in counts['party_affiliation'].items():
+            self.assertEqual(n, voters.filter(party__value=party).count())
+        self.assertEqual(counts['elections']['v20state'], voters.filter(party__value='D', v20state=True).count())
+
+
+class VoterListTests(VoterTestCase):
+    ''' the voter list shows the voters its total counts '''
+
+    def test_total_under_propensity_sort(self):
+        Voter.objects.update(propensity=None)
+        Voter.objects.filter(pk__in=Voter.objects.values('pk')[:7]).update(propensity=50.0)
+        for sort, total in (('name', self.count), ('likely', 7), ('unlikely', 7)):
+            response = self.client.get('/voter_analytics/', {'sort': sort, 'count': 'on'})
+            self.assertEqual(response.context['total_voters'], total)
+            self.assertEqual(len(response.context['voters']), min(total, 100))
+
+
+class KeysetPaginationTests(VoterTestCase):
+    ''' cursors seek on the ordering fields and fall back to the first page when invalid '''
+
+    def test_tampered_cursor_gives_first_page(self):
+        paginator = KeysetPaginator(Voter.objects.all(), 10)
+        first = [v.pk for v in paginator.page().object_list]
+        for values in (['a', 'b', 'notint'], ['a', 'b', None], ['a', 'b', [1]], ['a', 'b']):
+            page = paginator.page(encode_cursor(values, 'p'))
+            self.assertEqual([v.pk for v in page.object_list], first)
+            self.assertFalse(page.has_previous())
+
+    def test_next_then_previous_round_trips(self):
+        paginator = KeysetPaginator(Voter.objects.all(), 7)
+        pages = [paginator.page()]
+        while pages[-1].has_next():
+            pages.append(paginator.page(pages[-1].next_cursor))
+        self.assertEqual(sum(len(p.object_list) for p in pages), self.count)
+
+        # stepping back from each page lands on exactly the page before it
+        for before, page in zip(pages, pages[1:]):
+            back = paginator.page(page.previous_cursor)
+            self.assertEqual(back.object_list, before.object_list)
+            self.assertEqual(back.next_cursor, before.next_cursor)
+        self.assertFalse(paginator.page(pages[1].previous_cursor).has_previous())
+
+
+class SearchTests(VoterTestCase):
+    ''' full-text search ranks and pages matches, and survives filters that rule out every voter '''
+
+    def test_filters_matching_nothing(self):
+        for query in ('q=a&party=ZZZ', 'q=a&dataset=nope'):
+            response = self.client.get('/voter_analytics/', QueryDict(query))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(list(response.context['voters']), [])
+        self.assertEqual(search_voters(Voter.objects.none(), 'a').object_list, [])
+        self.assertEqual(search_voters(Voter.objects.all(), '!!').object_list, [])
+
+    def test_pages_of_matches(self):
+        voter = Voter.objects.first()
+        self.assertIn(voter, search_voters(Voter.objects.all(), voter.last_name[:3], per_page=1000).object_list)
+
+        # every match is shown once, across pages
+        everyone = search_voters(Voter.objects.all(), voter.last_name, per_page=1000)
+        self.assertFalse(everyone.has_next())
+        seen, page = [], search_voters(Voter.objects.all(), voter.last_name, 1, per_page=3)
+        while True:
+            seen += page.object_list
+            if not page.has_next():
+                break
+            page = search_voters(Voter.objects.all(), voter.last_name, page.next_page_number(), per_page=3)
+        self.assertEqual(seen, everyone.object_list)
+        # street names are made of last names too, so the namesakes are a subset of the matches
+        self.assertLessEqual(set(Voter.objects.filter(last_name=voter.last_name)), set(seen))
+
+
+class ExportTests(VoterTestCase):
+    ''' the export downloads the voters the list page shows for the same parameters '''
+
+    def export(self, query):
+        response = self.client.get('/voter_analytics/export/csv', QueryDict(query))
+        return b''.join(response.streaming_content).decode().splitlines()[1:]
+
+    def test_export_applies_search_and_sort(self):
+        name = Voter.objects.first().last_name
+        matches = search_voters(Voter.objects.all(), name, per_page=1000).object_list
+        self.assertEqual([int(line.split(',')[0]) for line in self.export(f'q={name}')], [v.pk for v in matches])
+
+        Voter.objects.filter(pk__in=[v.pk for v in matches[:5]]).update(propensity=99.0)
+        exported = self.export('min_propensity=99&sort=likely')
+        self.assertEqual(len(exported), 5)
+        self.assertEqual(int(exported[0].split(',')[0]), max(v.pk for v in matches[:5]))
+
+
+class SnapshotTests(VoterFileMixin, TransactionTestCase):
+    ''' snapshots restore the voters of every dataset into a database with its own lookup codes '''
+
+    def setUp(self):
+        super().setUp()
+        self.snapshot = os.path.join(os.path.dirname(self.path), 'voters.sqlite3')
+
+    def contents(self, dataset):
+        ''' return the decoded voters of a dataset, its stored rollups and the voter table's indexes '''
+        voters = sorted(
+            (v.voter_id, v.last_name, v.first_name, v.party_affiliation, v.zip_code, v.precinct_number, v.street_name)
+            for v in filter_dataset(Voter.objects.all(), dataset)
+        )
+        # keyed without the dataset's code, which differs between databases
+        rows = filter_dataset(VoterRollup.objects.all(), dataset).values(*ROLLUP_KEY, 'count')
+        rollups = Counter({tuple(row[k] for k in ROLLUP_KEY[1:]): row['count'] for row in rows})
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s",
+                           [Voter._meta.db_table])
+            indexes = sorted(name for (name,) in cursor.fetchall())
+        return voters, rollups, indexes
+
+    def test_round_trip_with_other_codes(self):
+        import_voters(self.path, 'town')
+        before = self.contents('town')
+        dump_voters(self.snapshot)
+
+        # a database that handed out its codes in another order, with a dataset the snapshot lacks
+        for model in (Voter, VoterRollup, PrecinctTurnout, Dataset, Party, Precinct, StreetName, ZipCode):
+            model.objects.all().delete()
+        for model in (Dataset, Party, Precinct, StreetName, ZipCode):
+            model.objects.create(value='decoy')
+        reset_process_caches()
+        import_voters(self.path, 'other town')
+        version = data_version(voter_data('other town'))
+
+        restore_voters(self.snapshot)
+        reset_process_caches()
+        self.assertEqual(self.contents('town'), before)
+        self.assertEqual(filter_dataset(Voter.objects.all(), 'other town').count(), 0)
+        self.assertGreater(data_version(voter_data('other town')), version)
+
+        voter = filter_dataset(Voter.objects.all(), 'town').first()
+        self.assertIn(voter, search_voters(filter_dataset(Voter.objects.all(), 'town'), voter.last_name,
+                                           per_page=1000).object_list)
+
+    def test_schema_mismatch(self):
+        dump_voters(self.snapshot)
+        with sqlite3.connect(self.snapshot) as snapshot:
+            snapshot.execute("UPDATE snapshot_info SET value = 'voter_analytics.0001_initial' WHERE key = 'schema'")
+        snapshot.close()
+        with self.assertRaises(SnapshotError):
+            restore_voters(self.snapshot)
+
+
+class MigrationTests(TransactionTestCase):
+    ''' migration 0009 moves the text of the coded fields into lookup tables and back '''
+
+    before = [('voter_analytics', '0008_dataversion')]
+    after = [('voter_analytics', '0009_coded_voter_fields')]
+
+    def migrate(self, targets):
+        ''' migrate to targets and return the historical models there '''
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+        reset_process_caches()
+
+    def test_coded_fields_round_trip(self):
+        apps = self.migrate(self.before)
+        rows = [('D', '02459', '1A', 'MAIN ST'), ('R', '02459', '2B', 'ELM ST'), ('D', '02460', '1A', 'MAIN ST')]
+        Voter = apps.get_model('voter_analytics', 'Voter')
+        for party, zip_code, precinct, street in rows:
+            Voter.objects.create(party_affiliation=party, zip_code=zip_code, precinct_number=precinct,
+                                 street_name=street, date_of_birth='1980-01-01', date_of_registration='2000-01-01')
+
+        apps = self.migrate(self.after)
+        Voter, Party = apps.get_model('voter_analytics', 'Voter'), apps.get_model('voter_analytics', 'Party')
+        self.assertEqual(sorted(Party.objects.values_list('value', flat=True)), ['D', 'R'])
+        coded = Voter.objects.order_by('pk').values_list('party__value', 'zip__value', 'precinct__value', 'street__value')
+        self.assertEqual(list(coded), rows)
+
+        apps = self.migrate(self.before)
+        Voter = apps.get_model('voter_analytics', 'Voter')
+        text = Voter.objects.order_by('pk').values_list('party_affiliation', 'zip_code', 'precinct_number', 'street_name')
+        self.assertEqual(list(text), rows)
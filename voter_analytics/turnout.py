@@ -0,0 +1,61 @@
+# File: turnout.py
+# Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/18/2026
+# Description: maintenance and querying of the precomputed PrecinctTurnout table
+
+from django.db import transaction
+from django.db.models import Sum
+from .analytics import elections, filter_dataset, grouped_counts
+from .models import PrecinctTurnout, Voter
+
+# levels turnout can be reported at, mapped to the PrecinctTurnout fields grouped on
+TURNOUT_LEVELS = {
+    'precinct': ['precinct_number'],
+    'zip': ['zip_code'],
+    'precinct_zip': ['precinct_number', 'zip_code'],
+}
+
+
+def rebuild_turnout(dataset):
+    ''' recompute the PrecinctTurnout rows of a dataset from its voters, returning the number of rows '''
+    rows = grouped_counts(filter_dataset(Voter.objects.all(), dataset), ['dataset_id', 'precinct_number', 'zip_code'])
+
+    with transaction.atomic():
+        filter_dataset(PrecinctTurnout.objects.all(), dataset).delete()
+        turnout = [
+            PrecinctTurnout(dataset_id=row['dataset_id'], precinct_number=row['precinct_number'],
+                            zip_code=row['zip_code'], voters=row['n'], **{e: row[e] for e in elections})
+            for row in rows
+        ]
+        PrecinctTurnout.objects.bulk_create(turnout, batch_size=1000)
+
+    return len(turnout)
+
+
+def turnout_rows(dataset, level='precinct'):
+    '''
+    Return the turnout of a dataset at a level of TURNOUT_LEVELS as a list
+    of dicts holding the grouped fields, the number of voters, how many
+    voted in each election and the turnout in percent, ordered by the
+    grouped fields.
+    '''
+    keys = TURNOUT_LEVELS[level]
+    rows = (filter_dataset(PrecinctTurnout.objects.all(), dataset)
+            .order_by(*keys)
+            .values(*keys)
+            .annotate(n=Sum('voters'), **{f'voted_{e}': Sum(e) for e in elections}))
+
+    result = []
+    for row in rows:
+        voted = {e: row[f'voted_{e}'] for e in elections}
+        result.append({
+            **{k: row[k] for k in keys},
+            'voters': row['n'],
+            'voted': voted,
+            'turnout': {e: round(100 * n / row['n'], 1) if row['n'] else 0.0 for e, n in voted.items()},
+        })
+    return result
+
+
+def turnout_payload(dataset, level='precinct'):
+    ''' return the turnout of a dataset at a level as a JSON-ready dict '''
+    return {'dataset': dataset, 'level': level, 'elections': elections, 'rows': turnout_rows(dataset, level)}
@@ -3,10 +3,17 @@
 # Description: url paths for voter_analytics webapp
 
 from django.urls import path   
-from .views import VoterListView, VoterDetailView, VoterGraphsView
+from .views import VoterListView, VoterDetailView, VoterGraphsView, VoterGraphsDataView, PlotlyJSView
+from .views import HouseholdListView, VoterExportView, VoterPivotView, VoterTurnoutView
 
 urlpatterns = [
     path('', VoterListView.as_view(), name="voter_list"),
     path('voters/<int:pk>', VoterDetailView.as_view(), name='voter_detail'),
+    path('households/', HouseholdListView.as_view(), name='households'),
+    path('export/<str:fmt>', VoterExportView.as_view(), name='voter_export'),
     path('graphs/', VoterGraphsView.as_view(), name='graphs'),
+    path('graphs/data', VoterGraphsDataView.as_view(), name='graphs_data'),
+    path('graphs/turnout', VoterTurnoutView.as_view(), name='turnout_data'),
+    path('pivot/<str:fmt>', VoterPivotView.as_view(), name='voter_pivot'),
+    path('plotly-<str:fingerprint>.js', PlotlyJSView.as_view(), name='plotly_js'),
 ]
\ No newline at end of file
@@ -2,21 +2,91 @@
 # Author: Sorathorn Thongpitukthavorn (plum@bu.edu), 10/29/2025
 # Description: logic/backend for voter_analytics
 
+import csv
+import json
 from datetime import date
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.utils.cache import patch_cache_control
+from django.views import View
 from django.views.generic import ListView, DetailView
+from cs412.fts import page_number
 from .models import Voter
-import plotly.graph_objects as go
-import plotly.offline as opy
+from .analytics import elections, filter_voters, parse_filters
+from .pagination import KeysetPaginator
+from .pivot import parse_dimensions, pivot_rows, pivot_table
+from .propensity import filter_propensity
+from .rollups import count_voters, summarize_rollups
+from .cache import cached_charts, cached_payload, filter_fingerprint
+from .charts import build_charts, build_turnout_charts, plotly_js
+from .columnar import get_store
+from .facets import facet_counts, facet_options
+from .households import count_households, households, occupants
+from .search import SEARCH_LIMIT, ranked_ids, search_voters
+from .turnout import TURNOUT_LEVELS, turnout_payload
 
-parties = [
-    'U', 'D', 'R', 'J', 'A', 'CC', 'X', 'L', 'Q', 'S', 'FF', 'G',
-    'HH', 'T', 'AA', 'GG', 'Z', 'O', 'P', 'E', 'V', 'H', 'Y', 'W',
-    'EE', 'K'
+# orderings of the voter list, each matching an index so pages can seek on it
+voter_sorts = {
+    'name': ('last_name', 'first_name', 'id'),
+    'likely': ('-propensity', '-id'),
+    'unlikely': ('propensity', 'id'),
+}
+
+# columns written by the voter export, in order
+export_fields = [
+    'id', 'last_name', 'first_name', 'street_number', 'street_name',
+    'apartment_number', 'zip_code', 'date_of_birth', 'date_of_registration',
+    'party_affiliation', 'precinct_number', *elections, 'voter_score',
 ]
-date_of_births = [str(year) for year in range(1920, 2005)]
-voter_scores = [str(i) for i in range(6)]
-elections = ['v20state', 'v21town', 'v21primary', 'v22general', 'v23town']
+
+def voter_sort(params):
+    ''' return the ordering of the voter list chosen in params, by name unless a known one is requested '''
+    sort = params.get('sort')
+    return sort if sort in voter_sorts else 'name'
+
+def list_voters(params):
+    '''
+    Return the voters the list page shows for params, before any search:
+    the filter form and propensity range applied, in the chosen sort.
+    '''
+    voters = filter_propensity(filter_voters(Voter.objects.all(), params), params)
+
+    # voters not scored yet have no place in a propensity ordering
+    if voter_sort(params) != 'name':
+        voters = voters.filter(propensity__isnull=False)
+    return voters.order_by(*voter_sorts[voter_sort(params)])
+
+def dataset(params):
+    ''' return the name of the dataset chosen in params '''
+    return parse_filters(params)['dataset']
+
+def summarize(params):
+    ''' chart totals for params from the columnar snapshot if enabled, else the rollup table '''
+    store = get_store(dataset(params))
+    return store.summarize(params) if store else summarize_rollups(params)
+
+def count(params):
+    ''' number of voters matching params from the columnar snapshot if enabled, else the rollup table '''
+    store = get_store(dataset(params))
+    return store.count(params) if store else count_voters(params)
+
+def graphs_payload(params):
+    ''' return the (cached) chart JSON for the voters matching params '''
+    return cached_charts(params, lambda: build_charts(summarize(params)))
+
+def filter_form(params):
+    ''' return the filter form options with their (cached) voter counts under the filters in params '''
+    counts = cached_payload(f'facets:{filter_fingerprint(params)}', lambda: facet_counts(params), dataset(params))
+    return facet_options(counts, params)
+
+def turnout(name, level):
+    ''' return the (cached) turnout rows of a dataset at a level of TURNOUT_LEVELS '''
+    return cached_payload(f'turnout:{level}', lambda: turnout_payload(name, level), name)
+
+def turnout_charts(name):
+    ''' return the (cached) precinct and zip code turnout heatmaps of a dataset; they ignore the other filters '''
+    return cached_payload('turnout_charts',
+                          lambda: build_turnout_charts(turnout(name, 'precinct'), turnout(name, 'zip')), name)
 
 class VoterListView(ListView):
     ''' load page of all voters '''
@@ -26,43 +96,61 @@ class VoterListView(ListView):
     paginate_by = 100
 
     def get_queryset(self):
-        ''' return filtered list of voters '''
-        voters = super().get_queryset()
-
-        # Filter by party
-        if 'party' in self.request.GET:
-            party = self.request.GET['party']
-            if party:
-                voters = Voter.objects.filter(party_affiliation=party)
-
-        # Filter by min and max year of birth
-        if 'min_dob_year' in self.request.GET and 'max_dob_year' in self.request.GET:
-            min_year = self.request.GET['min_dob_year']
-            max_year = self.request.GET['max_dob_year']
-            if min_year and max_year:
-                voters = voters.filter(date_of_birth__year__range=[min_year, max_year])
-
-        # Filter by voter score
-        if 'voter_score' in self.request.GET:
-            voter_score = self.request.GET['voter_score']
-            if voter_score:
-                voters = voters.filter(voter_score=voter_score)
-
-        # Filter by previous election participation
-        for election in self.request.GET:
-            if election in elections and self.request.GET.get(election) == 'on':
-                voters = voters.filter(**{f"{election}": True})
-
+        ''' return filtered list of voters, best search matches first when searching '''
+        voters = list_voters(self.request.GET)
+        if self.search_query():
+            self.search_page = search_voters(voters, self.search_query(), page_number(self.request.GET), SEARCH_LIMIT)
+            return self.search_page.object_list
         return voters
+
+    def sort(self):
+        ''' return the chosen ordering of the list '''
+        return voter_sort(self.request.GET)
+
+    def uses_propensity(self):
+        '''
+        whether the propensity range or sort, which the precomputed totals know
+        nothing of, is in use; either leaves out the voters not scored yet
+        '''
+        return self.sort() != 'name' or any(self.request.GET.get(f) for f in ('min_propensity', 'max_propensity'))
+
+    def search_query(self):
+        ''' return the text typed in the search box '''
+        return self.request.GET.get('q', '').strip()
+
+    def use_keyset(self):
+        ''' page with cursors unless an old-style ?page= link was followed or a search was made '''
+        return 'page' not in self.request.GET and not self.search_query()
+
+    def get_paginate_by(self, queryset):
+        ''' leave OFFSET pagination to ListView only when a page number is requested '''
+        return None if self.use_keyset() or self.search_query() else self.paginate_by
     
     def get_context_data(self, **kwargs):
         ''' provide selection for filters '''
         context = super().get_context_data(**kwargs)
 
-        context['parties'] = parties
-        context['date_of_births'] = date_of_births
-        context['voter_scores'] = voter_scores
-        context['elections'] = elections
+        # seek to the requested page instead of counting and skipping rows
+        if self.use_keyset():
+            paginator = KeysetPaginator(self.object_list, self.paginate_by, ordering=voter_sorts[self.sort()])
+            page = paginator.page(self.request.GET.get('cursor'))
+            context['cursor_page'] = page
+            context['voters'] = page.object_list
+            context['object_list'] = page.object_list
+
+            # the total comes from precomputed data rather than COUNT(*) on every page
+            if self.request.GET.get('count') == 'on':
+                if self.uses_propensity():
+                    context['total_voters'] = self.object_list.count()
+                else:
+                    context['total_voters'] = count(self.request.GET)
+
+        if self.search_query():
+            context['search_page'] = self.search_page
+
+        context['sort'] = self.sort()
+
+        context.update(filter_form(self.request.GET))
 
         return context
     
@@ -72,6 +160,41 @@ class VoterDetailView(DetailView):
     template_name = 'show_voter.html'
     context_object_name = 'voter'
 
+class HouseholdListView(ListView):
+    ''' load page of the households with voters matching the filters, with their occupants '''
+    model = Voter
+    template_name = 'households.html'
+    context_object_name = 'households'
+    paginate_by = 50
+
+    def get_queryset(self):
+        ''' return the filtered voters; they are grouped into households a page at a time '''
+        return filter_voters(super().get_queryset(), self.request.GET)
+
+    def get_paginate_by(self, queryset):
+        ''' households are paged with cursors below, never by ListView '''
+        return None
+
+    def get_context_data(self, **kwargs):
+        ''' provide one page of households, their occupants and selection for filters '''
+        voters = self.object_list
+        context = super().get_context_data(object_list=[], **kwargs)
+
+        # seek through the household index instead of grouping the whole table
+        paginator = KeysetPaginator(households(voters), self.paginate_by, ordering=('household',))
+        page = paginator.page(self.request.GET.get('cursor'))
+        residents = occupants(voters, [h['household'] for h in page.object_list])
+        for h in page.object_list:
+            h['voters'] = residents[h['household']]
+
+        context['cursor_page'] = page
+        context['households'] = page.object_list
+        if self.request.GET.get('count') == 'on':
+            context['total_households'] = count_households(voters)
+
+        context.update(filter_form(self.request.GET))
+        return context
+
 class VoterGraphsView(ListView):
     model = Voter
     template_name = 'graphs.html'
@@ -79,33 +202,7 @@ class VoterGraphsView(ListView):
 
     def get_queryset(self):
         ''' return filtered list of voters '''
-        voters = super().get_queryset()
-
-        # Filter by party
-        if 'party' in self.request.GET:
-            party = self.request.GET['party']
-            if party:
-                voters = Voter.objects.filter(party_affiliation=party)
-
-        # Filter by min and max year of birth
-        if 'min_dob_year' in self.request.GET and 'max_dob_year' in self.request.GET:
-            min_year = self.request.GET['min_dob_year']
-            max_year = self.request.GET['max_dob_year']
-            if min_year and max_year:
-                voters = voters.filter(date_of_birth__year__range=[min_year, max_year])
-
-        # Filter by voter score
-        if 'voter_score' in self.request.GET:
-            voter_score = self.request.GET['voter_score']
-            if voter_score:
-                voters = voters.filter(voter_score=voter_score)
-
-        # Filter by previous election participation
-        for election in self.request.GET:
-            if election in elections and self.request.GET.get(election) == 'on':
-                voters = voters.filter(**{f"{election}": True})
-
-        return voters
+        return filter_voters(super().get_queryset(), self.request.GET)
 
     def get_context_data(self, **kwargs) :
         '''
@@ -113,93 +210,125 @@ class VoterGraphsView(ListView):
         '''
         # start with superclass context
         context = super().get_context_data(**kwargs)
-        voters = self.get_queryset()
- 
-        # Histogram (Bar Chart): Distribution of Voters by Year of Birth
-        
-        # aggregate year of births
-        birth_year_counts = {}
-        for voter in voters:
-            if voter.date_of_birth:
-                year = voter.date_of_birth.year
-                birth_year_counts[year] = birth_year_counts.get(year, 0) + 1
-        
-        # sort by year
-        x_birth = sorted([year for year in birth_year_counts.keys()])
-        y_birth = [birth_year_counts[year] for year in x_birth]
-
-        # generate the Bar chart
-        fig = go.Bar(x=x_birth, y=y_birth)
-        title_text = "Distribution of Voters by Year of Birth"
-        
-        # obtain the graph as an HTML div
-        graph_div_birth_year = opy.plot({"data": [fig], 
-                                         "layout_title_text": title_text,
-                                         "layout": {"xaxis": {"title": "Year of Birth"},
-                                                    "yaxis": {"title": "Number of Voters"}}
-                                        }, 
-                                        auto_open=False, 
-                                        output_type="div")
-        # send div as template context variable
-        context['graph_div_birth_year'] = graph_div_birth_year
-
-        # Pie Chart: Distribution of Voters by Party Affiliation
-        
-        # aggregate party affiliations
-        party_counts = {}
-        for voter in voters:
-            if voter.party_affiliation:
-                party = voter.party_affiliation
-                party_counts[party] = party_counts.get(party, 0) + 1
-        
-        # Prepare labels and values for the chart
-        x_party = list(party_counts.keys())
-        y_party = list(party_counts.values())
-
-        # generate the Pie chart
-        fig = go.Pie(labels=x_party, values=y_party)
-        title_text = "Voter Party Affiliation Distribution"
-        
-        # obtain the graph as an HTML div
-        graph_div_party = opy.plot({"data": [fig], 
-                                    "layout_title_text": title_text,
-                                   }, 
-                                   auto_open=False, 
-                                   output_type="div")
-        # send div as template context variable
-        context['graph_div_party'] = graph_div_party
-
-        # Histogram (Bar Chart): Distribution of Voters by Election Participation
-        
-        election_data = []
-        # Iterate through the election fields and count voters who participated
-        for election in elections:
-            count = voters.filter(**{f"{election}": True}).count()
-            election_data.append(count)
-        
-        # generate the Bar chart
-        x_elections = elections 
-        y_elections = election_data
-        
-        fig = go.Bar(x=x_elections, y=y_elections)
-        title_text = "Voter Participation in Each Election"
-        
-        # obtain the graph as an HTML div
-        graph_div_election_participation = opy.plot({"data": [fig], "layout_title_text": 
-                                                        title_text,"layout": {"xaxis": {"title": "Election"},
-                                                                              "yaxis": {"title": "Number of Voters"}}
-                                                    }, 
-                                                    auto_open=False, 
-                                                    output_type="div")
-        context['graph_div_election_participation'] = graph_div_election_participation
 
-        # add filtering payload to context
+        # reuse the graphs built for the same filters since the last import
+        payload = graphs_payload(self.request.GET)
+        context['charts'] = {**payload, 'charts': {**payload['charts'], **turnout_charts(dataset(self.request.GET))}}
+        context['plotly_fingerprint'] = plotly_js()[1]
 
-        context['parties'] = parties
-        context['date_of_births'] = date_of_births
-        context['voter_scores'] = voter_scores
-        context['elections'] = elections
+        # add filtering payload to context
+        context.update(filter_form(self.request.GET))
 
         return context
 
-        return context
\ No newline at end of file
+class VoterGraphsDataView(View):
+    ''' return the graphs for the current filters as JSON '''
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(graphs_payload(request.GET))
+
+class VoterTurnoutView(View):
+    ''' return voter turnout in each election by precinct, zip code or both (?by=) as JSON '''
+
+    def get(self, request, *args, **kwargs):
+        level = request.GET.get('by', 'precinct')
+        if level not in TURNOUT_LEVELS:
+            raise Http404(f'unknown turnout level: {level}')
+        return JsonResponse(turnout(dataset(request.GET), level))
+
+class VoterPivotView(View):
+    ''' return a cross-tab of the filtered voters over ?dims= as JSON or CSV '''
+
+    def get(self, request, *args, **kwargs):
+        fmt = kwargs['fmt']
+        if fmt not in ('json', 'csv'):
+            raise Http404(f'unknown pivot format: {fmt}')
+        try:
+            dims = parse_dimensions(request.GET)
+        except ValueError as e:
+            return HttpResponseBadRequest(str(e))
+
+        # the same table is reused for the same dimensions and filters until the next import
+        key = f'pivot:{",".join(dims)}:{filter_fingerprint(request.GET)}'
+        table = cached_payload(key, lambda: pivot_table(request.GET, dims), dataset(request.GET))
+
+        if fmt == 'json':
+            return JsonResponse(table)
+
+        response = HttpResponse(content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="voters_{"_".join(dims)}.csv"'
+        csv.writer(response).writerows(pivot_rows(table))
+        return response
+
+class PlotlyJSView(View):
+    ''' serve the plotly.js bundle under a fingerprinted URL so browsers cache it for good '''
+
+    def get(self, request, *args, **kwargs):
+        source, fingerprint = plotly_js()
+        if kwargs['fingerprint'] != fingerprint:
+            raise Http404('unknown plotly.js version')
+
+        response = HttpResponse(source, content_type='text/javascript; charset=utf-8')
+        patch_cache_control(response, public=True, max_age=60 * 60 * 24 * 365, immutable=True)
+        return response
+
+def coded_column(name):
+    ''' return the ORM path to the text of a voter field, following codes to their lookup table '''
+    coded = Voter.CODED_FIELDS.get(name)
+    return f'{coded[0]}__value' if coded else name
+
+class Echo:
+    ''' file-like object whose write() hands the line back, so csv.writer can feed a stream '''
+
+    def write(self, value):
+        return value
+
+class VoterExportView(View):
+    ''' stream the filtered voter list as CSV or NDJSON without loading it into memory '''
+
+    chunk_size = 2000
+
+    def rows(self, request):
+        '''
+        Return an iterator over the export columns of the voters the list page
+        shows for the same parameters: filtered, in the chosen sort, or every
+        search match best first when searching.
+        '''
+        voters = list_voters(request.GET)
+        columns = [coded_column(f) for f in export_fields]
+        query = request.GET.get('q', '').strip()
+        if query:
+            return self.ranked_rows(voters.values_list('pk', *columns), ranked_ids(voters, query))
+        return voters.values_list(*columns).iterator(chunk_size=self.chunk_size)
+
+    def ranked_rows(self, rows, ids):
+        ''' yield the rows of the voters with these ids in the order of ids, a chunk at a time '''
+        for i in range(0, len(ids), self.chunk_size):
+            chunk = ids[i:i + self.chunk_size]
+            found = {row[0]: row[1:] for row in rows.filter(pk__in=chunk)}
+            yield from (found[pk] for pk in chunk if pk in found)
+
+    def csv_lines(self, rows):
+        ''' yield the header and each voter as a CSV line '''
+        writer = csv.writer(Echo())
+        yield writer.writerow(export_fields)
+        for row in rows:
+            yield writer.writerow(row)
+
+    def ndjson_lines(self, rows):
+        ''' yield each voter as one JSON object per line '''
+        for row in rows:
+            yield json.dumps(dict(zip(export_fields, row)), default=date.isoformat) + '\n'
+
+    def get(self, request, *args, **kwargs):
+        fmt = kwargs['fmt']
+        if fmt == 'csv':
+            lines, content_type = self.csv_lines(self.rows(request)), 'text/csv'
+        elif fmt == 'ndjson':
+            lines, content_type = self.ndjson_lines(self.rows(request)), 'application/x-ndjson'
+        else:
+            raise Http404(f'unknown export format: {fmt}')
+
+        response = StreamingHttpResponse(lines, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="voters.{fmt}"'
+        return response